@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Model
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+ROLE_CLAIM = 'role'
+
+ROLE_VERSION_CLAIM = 'role_version'
+
+SUPERUSER_CLAIM = 'is_superuser'
+
+
+class RoleAccessToken(AccessToken):
+    """Access token carrying user role for permission checks."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[ROLE_VERSION_CLAIM] = user.role_version
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        return token
+
+
+class ClaimsUser(SimpleLazyObject):
+    """User answering permission checks from token claims.
+
+    Other attributes are loaded from database on first access.
+    """
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(
+            lambda: User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        )
+        self.__dict__['token'] = token
+
+    @property
+    def pk(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    id = pk
+
+    @property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_superuser(self):
+        return self.token[SUPERUSER_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == User.Roles.ADMIN or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        return self.role == User.Roles.MODERATOR
+
+    is_active = True
+
+    is_anonymous = False
+
+    is_authenticated = True
+
+    def __eq__(self, other):
+        if isinstance(other, Model):
+            return isinstance(other, User) and other.pk == self.pk
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Authenticate user by token claims without loading him.
+
+    Token is rejected when user role, superuser or active flag changed
+    since it was issued. Tokens without role claim load user as usual.
+    """
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        role_version = User.get_role_version(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        if role_version != validated_token.get(ROLE_VERSION_CLAIM):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен',
+                code='token_not_valid',
+            )
+        return ClaimsUser(validated_token)
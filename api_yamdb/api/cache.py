@@ -0,0 +1,54 @@
+from hashlib import blake2b
+from time import time_ns
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+
+def get_generation_key(name):
+    return f'generation:{name}'
+
+
+def get_generation(name):
+    """Return generation of cached responses group.
+
+    Missing generation is initialized with current time, so it never
+    matches keys of responses cached before eviction.
+    """
+    key = get_generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(*names):
+    """Make responses cached for previous generations unreachable."""
+    for name in names:
+        try:
+            cache.incr(get_generation_key(name))
+        except ValueError:
+            get_generation(name)
+
+
+def get_response_cache_key(request, name, params):
+    """Return cache key of response for given query string parameters."""
+    query = urlencode(sorted(
+        (param, value)
+        for param in params
+        for value in request.query_params.getlist(param)
+        if value != ''
+    ))
+    return f'response:{name}:{request.get_host()}:{query}'
+
+
+def get_etag(request, *names):
+    """Return strong ETag of response for current generations of groups."""
+    generations = ':'.join(str(get_generation(name)) for name in names)
+    digest = blake2b(
+        f'{generations}:{request.build_absolute_uri()}:'
+        f'{request.headers.get("Accept", "")}'.encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f'"{digest}"'
@@ -1,13 +1,203 @@
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from rest_framework.fields import empty
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
 )
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 from rest_framework.viewsets import GenericViewSet
 
+from api_yamdb.settings import (
+    RESPONSE_CACHE_REFRESH_TIMEOUT,
+    RESPONSE_CACHE_TIMEOUT,
+)
+from .cache import get_etag, get_generation, get_response_cache_key
+from .db_routers import read_database
+from .middleware import server_timing, timed_phase
+
+
+class TimedSerializerMixin:
+    """Mixin measuring validation and representation as serializer phase."""
+
+    def run_validation(self, data=empty):
+        with timed_phase('serializer'):
+            return super().run_validation(data)
+
+    def to_representation(self, instance):
+        with timed_phase('serializer'):
+            return super().to_representation(instance)
+
+
+@lru_cache(maxsize=None)
+def get_timed_serializer(serializer_class):
+    """Return serializer subclass reporting its phase to Server-Timing."""
+    return type(
+        serializer_class.__name__,
+        (TimedSerializerMixin, serializer_class),
+        {'__module__': serializer_class.__module__},
+    )
+
+
+class ServerTimingMixin:
+    """Mixin measuring permission and serializer phases of viewset."""
+
+    def check_permissions(self, request):
+        with timed_phase('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timed_phase('permissions'):
+            super().check_object_permissions(request, obj)
+
+    def get_serializer(self, *args, **kwargs):
+        if server_timing.get() is None:
+            return super().get_serializer(*args, **kwargs)
+        kwargs.setdefault('context', self.get_serializer_context())
+        return get_timed_serializer(self.get_serializer_class())(
+            *args, **kwargs
+        )
+
+
+class CachedListMixin:
+    """Mixin caching list responses until generation of basename bumps.
+
+    Response cached for previous generation is served as stale one while
+    a single request holding refresh lock recomputes it. Responses read
+    from replica aren't cached, it may lag behind current generation.
+    """
+
+    cache_params = ('page', 'search')
+
+    def list(self, request, *args, **kwargs):
+        key = get_response_cache_key(request, self.basename, self.cache_params)
+        generation = get_generation(self.basename)
+        cached = cache.get(key)
+        refresh_key = f'{key}:refresh'
+        refreshing = False
+        if cached is not None:
+            if cached['generation'] == generation:
+                return Response(cached['data'], headers={'X-Cache': 'HIT'})
+            refreshing = cache.add(
+                refresh_key, True, RESPONSE_CACHE_REFRESH_TIMEOUT
+            )
+            if not refreshing:
+                return Response(cached['data'], headers={'X-Cache': 'STALE'})
+        try:
+            response = super().list(request, *args, **kwargs)
+            if read_database.get() is None:
+                cache.set(
+                    key,
+                    {'generation': generation, 'data': response.data},
+                    RESPONSE_CACHE_TIMEOUT,
+                )
+        finally:
+            if refreshing:
+                cache.delete(refresh_key)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ETagMixin:
+    """Mixin answering conditional GET requests before serialization.
+
+    ETag is derived from generation of cached responses group, so it
+    changes on any write to objects shown by the view. Generations of
+    related objects shown in every response, like author usernames, are
+    listed in etag_shared_generations. Responses read from replica get
+    no ETag, it may lag behind current generation.
+    """
+
+    etag_shared_generations = ()
+
+    def get_etag_generation(self):
+        return self.basename
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        """Return 304 if client has current ETag, else response of handler."""
+        etag = get_etag(
+            request,
+            self.get_etag_generation(),
+            *self.etag_shared_generations,
+        )
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(
+                status=HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        response = handler(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK and read_database.get() is None:
+            response['ETag'] = etag
+        return response
+
+
+class NestedRouteMixin:
+    """Mixin resolving parent object of nested route once per request.
+
+    parent_lookups maps url kwargs to fields of the parent model. Queryset
+    is filtered by url kwargs without loading the parent, its existence
+    is checked only to answer 404 instead of empty list.
+    """
+
+    parent_field = None
+
+    parent_lookups = {}
+
+    def get_parent_filter(self, prefix=''):
+        return {
+            f'{prefix}{lookup}': self.kwargs.get(kwarg)
+            for kwarg, lookup in self.parent_lookups.items()
+        }
+
+    def get_parent_model(self):
+        return self.queryset.model._meta.get_field(
+            self.parent_field
+        ).related_model
+
+    def get_parent(self):
+        """Return parent object, it is loaded on the first call only."""
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.get_parent_model(), **self.get_parent_filter()
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            **self.get_parent_filter(f'{self.parent_field}__')
+        )
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        results = response.data
+        if isinstance(results, dict):
+            results = results.get('results')
+        if not results and not self.get_parent_model().objects.filter(
+            **self.get_parent_filter()
+        ).exists():
+            raise Http404
+        return response
+
 
 class CreateListDestroyModelViewSet(
+    ServerTimingMixin,
+    CachedListMixin,
     CreateModelMixin,
     DestroyModelMixin,
     GenericViewSet,
@@ -0,0 +1,25 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+read_database = ContextVar('read_database', default=None)
+
+
+class ReplicaRouter:
+    """Send reads to replica chosen by ReplicaMiddleware, writes to primary.
+
+    Without chosen replica reads go to primary database too.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.REPLICA_DATABASES
@@ -1,12 +1,12 @@
 from django_filters import rest_framework as filters
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
     """Class for definition title filter fields."""
     category = filters.CharFilter(
         field_name='category__slug',
-        lookup_expr='icontains'
     )
     genre = filters.CharFilter(
         field_name='genre__slug',
@@ -16,11 +16,23 @@ class TitleFilter(filters.FilterSet):
         field_name='name',
         lookup_expr='icontains'
     )
+    search = filters.CharFilter(method='filter_search')
     year = filters.NumberFilter(
         field_name='year',
-        lookup_expr='icontains'
+    )
+    year_max = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='lte'
+    )
+    year_min = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='gte'
     )
 
     class Meta:
         model = Title
         fields = '__all__'
+
+    def filter_search(self, queryset, name, value):
+        """Full-text search by name and description ordered by relevance."""
+        return search_titles(queryset, value)
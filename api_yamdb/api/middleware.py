@@ -0,0 +1,232 @@
+import json
+import random
+import threading
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from hashlib import blake2b
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http import QueryDict
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.settings import REPLICA_RETRY_TIMEOUT, REPLICA_STICKY_TIMEOUT
+from .db_routers import read_database
+
+server_timing = ContextVar('server_timing', default=None)
+
+
+class ServerTiming:
+    """Durations of request phases and amount of SQL queries."""
+
+    metrics = ('db', 'permissions', 'serializer', 'total')
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.queries = 0
+        self.active = set()
+
+    @contextmanager
+    def phase(self, name):
+        """Add duration of the block to the phase, nested blocks once."""
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] += perf_counter() - started
+            self.active.discard(name)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        self.queries += 1
+        with self.phase('db'):
+            return execute(sql, params, many, context)
+
+    def get_header(self):
+        """Return Server-Timing header value with durations in ms."""
+        return ', '.join(
+            f'{name};dur={self.durations[name] * 1000:.2f}'
+            for name in self.metrics
+            if name in self.durations
+        )
+
+
+@contextmanager
+def timed_phase(name):
+    """Measure the block as request phase if ServerTimingMiddleware is on."""
+    timing = server_timing.get()
+    if timing is None:
+        yield
+        return
+    with timing.phase(name):
+        yield
+
+
+class ServerTimingMiddleware:
+    """Add Server-Timing and X-DB-Queries headers to responses.
+
+    Phases overlap: queries made while serializing are counted both in
+    db and serializer durations.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = ServerTiming()
+        token = server_timing.set(timing)
+        try:
+            with timing.phase('total'), ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timing.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            server_timing.reset(token)
+        response['Server-Timing'] = timing.get_header()
+        response['X-DB-Queries'] = timing.queries
+        return response
+
+
+class RequestRecordingMiddleware:
+    """Append sanitized requests to JSONL file for replay_traffic command.
+
+    Authorization header is not recorded, only role of the user. Secrets
+    are masked and emails are replaced by fake ones, stable per address.
+    """
+
+    redacted_fields = ('confirmation_code', 'password', 'token')
+
+    lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        body = self.get_body(request)
+        response = self.get_response(request)
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'query': dict(request.GET.lists()),
+            'body': self.sanitize(body),
+            'role': self.get_role(request),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self.lock, open(
+            settings.RECORD_REQUESTS_PATH, mode='a', encoding='utf-8'
+        ) as f:
+            f.write(f'{line}\n')
+        return response
+
+    @staticmethod
+    def get_body(request):
+        """Return parsed JSON or form body, None for other ones."""
+        if request.content_type == 'application/json':
+            try:
+                return json.loads(request.body)
+            except ValueError:
+                return None
+        if request.content_type == 'application/x-www-form-urlencoded':
+            return QueryDict(request.body).dict()
+        if (
+            request.content_type == 'multipart/form-data'
+            and request.method == 'POST'
+        ):
+            return request.POST.dict()
+        return None
+
+    def sanitize(self, value):
+        if isinstance(value, list):
+            return [self.sanitize(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        sanitized = {}
+        for key, item in value.items():
+            if key in self.redacted_fields:
+                item = '***'
+            elif key == 'email' and isinstance(item, str):
+                item = self.get_fake_email(item)
+            sanitized[key] = self.sanitize(item)
+        return sanitized
+
+    @staticmethod
+    def get_fake_email(email):
+        digest = blake2b(
+            email.lower().encode(),
+            digest_size=8,
+            key=settings.SECRET_KEY.encode()[:64],
+        ).hexdigest()
+        return f'{digest}@yamdb.fake'
+
+    @staticmethod
+    def get_role(request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return 'superuser' if user.is_superuser else user.role
+
+
+class ReplicaMiddleware:
+    """Read from replica databases during safe requests.
+
+    Clients that wrote within REPLICA_STICKY_TIMEOUT read from primary to
+    see their own changes. Replicas failing to connect are skipped for
+    REPLICA_RETRY_TIMEOUT.
+    """
+
+    unavailable = {}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sticky_key = self.get_sticky_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                cache.set(sticky_key, True, REPLICA_STICKY_TIMEOUT)
+            return response
+        if cache.get(sticky_key):
+            return self.get_response(request)
+        token = read_database.set(self.get_replica())
+        try:
+            return self.get_response(request)
+        finally:
+            read_database.reset(token)
+
+    @staticmethod
+    def get_sticky_key(request):
+        """Return cache key of client by credentials, session or IP."""
+        client = (
+            request.headers.get('Authorization')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get('REMOTE_ADDR', '')
+        )
+        return 'replica_sticky:' + blake2b(
+            client.encode(), digest_size=16
+        ).hexdigest()
+
+    def get_replica(self):
+        """Return alias of random available replica or None for primary."""
+        now = monotonic()
+        replicas = [
+            alias for alias in settings.REPLICA_DATABASES
+            if self.unavailable.get(alias, 0) <= now
+        ]
+        random.shuffle(replicas)
+        for alias in replicas:
+            try:
+                connections[alias].ensure_connection()
+            except DatabaseError:
+                self.unavailable[alias] = now + REPLICA_RETRY_TIMEOUT
+                continue
+            return alias
+        return None
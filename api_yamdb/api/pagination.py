@@ -0,0 +1,42 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Keyset pagination over publication date with id as tie-breaker.
+
+    Ordered by sort_date copy of pub_date, which is indexed together with
+    parent id in review and comment tables.
+    """
+
+    ordering = ('sort_date', 'pk')
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """Page number pagination with opt-in cursor mode.
+
+    Cursor mode is enabled by passing `cursor` query parameter,
+    empty value requests the first page.
+    """
+
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Delegate to cursor paginator if client asked for it."""
+        self.cursor_paginator = None
+        cursor_paginator = self.cursor_pagination_class()
+        if cursor_paginator.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = cursor_paginator
+        return cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Return response in format of selected pagination mode."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        """Render controls of selected pagination mode."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework.serializers import (
     CharField,
@@ -12,11 +13,11 @@ from rest_framework.serializers import (
     SlugRelatedField,
     ValidationError
 )
+from rest_framework.settings import api_settings
 
 from api_yamdb.settings import (
     CHAR_FIELD_MAX_LENGTH,
     EMAIL_FIELD_MAX_LENGTH,
-    NO_REPLY,
     USERNAME_FIELD_MAX_LENGTH,
 )
 from reviews.models import (
@@ -26,6 +27,7 @@ from reviews.models import (
     Review,
     Title
 )
+from users.models import OutgoingEmail
 from users.validators import check_username_for_me_value
 
 User = get_user_model()
@@ -85,22 +87,21 @@ class ReviewSerializer(ModelSerializer):
         )
         model = Review
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if (
-            request.method == 'POST'
-            and Review.objects.filter(
-                title=get_object_or_404(
-                    Title,
-                    pk=self.context.get('view').kwargs.get('title_id')
-                ),
-                author=request.user
-            ).exists()
-        ):
-            raise ValidationError(
+    def create(self, validated_data):
+        """Insert review relying on unique_author_title constraint."""
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+        raise ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
                 'Вы уже оставляли отзыв на это произведение!'
-            )
-        return data
+            ],
+        })
 
 
 class TitleGetSerializer(ModelSerializer):
@@ -108,7 +109,7 @@ class TitleGetSerializer(ModelSerializer):
 
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
-    rating = IntegerField(default=None)
+    rating = IntegerField(default=None, read_only=True)
 
     class Meta:
         fields = (
@@ -144,7 +145,7 @@ class TitleSerializer(ModelSerializer):
 
     def to_representation(self, title):
         """Define serializer for output."""
-        return TitleGetSerializer(title).data
+        return TitleGetSerializer(title, context=self.context).data
 
 
 class UserRegistrationSerializer(Serializer):
@@ -162,38 +163,61 @@ class UserRegistrationSerializer(Serializer):
 
     @staticmethod
     def send_code_to_email(email: str, code: str):
-        send_mail(
-            fail_silently=True,
-            from_email=NO_REPLY,
+        """Add email with code to outbox drained by send_emails command."""
+        OutgoingEmail.enqueue(
             message=(
                 f'Ваш код подтверждения для портала YaMDB:\n{code}\n'
                 'Направьте POST-запрос с кодом и вашим логином'
                 'по адресу auth/token/ для получения веб токена.'
             ),
-            recipient_list=[email],
+            recipient=email,
             subject='Код подтверждения для портала YaMDb',
         )
 
     def create(self, validated_data):
-        """Return new User instance."""
-        user, _ = User.objects.get_or_create(**validated_data)
-        self.send_code_to_email(
-            email=user.email,
-            code=default_token_generator.make_token(user)
-        )
+        """Return user found by validate or insert new one.
+
+        User and outbox email are written in one transaction, parallel
+        signup of the same user is resolved in savepoint.
+        """
+        with transaction.atomic():
+            user = self.matching_user
+            if user is None:
+                try:
+                    with transaction.atomic():
+                        user = User.objects.create(**validated_data)
+                except IntegrityError:
+                    user = self.get_matching_user(validated_data)
+                    if user is None:
+                        raise
+            self.send_code_to_email(
+                email=user.email,
+                code=default_token_generator.make_token(user)
+            )
         return user
 
     def validate(self, attrs):
         """Check fields request values."""
+        self.matching_user = self.get_matching_user(attrs)
+        return attrs
+
+    @staticmethod
+    def get_matching_user(attrs):
+        """Return user with both email and username by one OR query.
+
+        Raise ValidationError if they belong to different users.
+        """
         email = attrs.get('email')
         error_message: dict = {}
         username = attrs.get('username')
-
-        if User.objects.filter(**attrs).exists():
-            return attrs
-
-        same_email_user = User.objects.filter(email=email).first()
-        same_username_user = User.objects.filter(username=username).first()
+        same_email_user = same_username_user = None
+        for user in User.objects.filter(
+            Q(email=email) | Q(username=username)
+        ):
+            if user.email == email:
+                same_email_user = user
+            if user.username == username:
+                same_username_user = user
 
         if same_email_user != same_username_user:
             if same_email_user is not None:
@@ -205,7 +229,7 @@ class UserRegistrationSerializer(Serializer):
                     'username': 'Пользователь с таким именем существует'
                 })
             raise ValidationError(error_message)
-        return attrs
+        return same_email_user
 
 
 class UserGettingTokenSerializer(Serializer):
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+)
+from .cache import bump_generation
+
+User = get_user_model()
+
+CACHE_GENERATIONS = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    GenreTitle: ('titles',),
+    Review: ('titles',),
+    Title: ('titles',),
+}
+
+
+@receiver(m2m_changed)
+@receiver(post_delete)
+@receiver(post_save)
+def invalidate_cached_responses(sender, **kwargs):
+    """Bump generations of responses depending on changed model."""
+    if (
+        sender in CACHE_GENERATIONS
+        and not kwargs.get('action', '').startswith('pre_')
+    ):
+        bump_generation(*CACHE_GENERATIONS[sender])
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Review)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    """Change ETag of reviews of the title."""
+    bump_generation(f'reviews:{instance.title_id}')
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_deleted_title_reviews(sender, instance, **kwargs):
+    """Change ETag of reviews of deleted title, even empty list of them."""
+    bump_generation(f'reviews:{instance.pk}')
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review_comments(sender, instance, **kwargs):
+    """Change ETag of comments of deleted review."""
+    bump_generation(f'comments:{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_usernames(sender, instance, created, **kwargs):
+    """Change ETags of reviews and comments when username changes."""
+    if not created and (
+        getattr(instance, '_loaded_username', None) != instance.username
+    ):
+        bump_generation('users')
+    instance._loaded_username = instance.username
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Comment)
+def invalidate_review_comments(sender, instance, **kwargs):
+    """Change ETag of comments of the review."""
+    bump_generation(f'comments:{instance.review_id}')
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Tune new SQLite connection with SQLITE_PRAGMAS setting."""
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,228 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import lru_cache
+from hashlib import blake2b
+from time import time
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+from api_yamdb.settings import (
+    THROTTLE_LOCK_STRIPES,
+    THROTTLE_STORE_PATH,
+    THROTTLE_STORE_SLOTS,
+)
+
+COUNTERS = ('admitted', 'rejected')
+
+
+def get_bucket_tokens(tokens, updated, capacity, rate, now):
+    """Return tokens of bucket refilled since last update."""
+    if updated is None or updated > now:
+        return capacity
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class InProcessBucketStore:
+    """Token buckets in process memory guarded by striped locks."""
+
+    max_stripe_keys = 10000
+
+    def __init__(self, stripes=THROTTLE_LOCK_STRIPES):
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.buckets = [{} for _ in range(stripes)]
+        self.counters_lock = threading.Lock()
+        self.counters = defaultdict(int)
+
+    def consume(self, key, capacity, rate):
+        """Take token from bucket of the key, return False if it's empty."""
+        stripe = hash(key) % len(self.locks)
+        with self.locks[stripe]:
+            buckets = self.buckets[stripe]
+            now = time()
+            tokens = get_bucket_tokens(
+                *buckets.get(key, (None, None)), capacity, rate, now
+            )
+            if tokens < 1:
+                return False
+            buckets[key] = (tokens - 1, now)
+            if len(buckets) > self.max_stripe_keys:
+                self.forget_full_buckets(buckets, capacity, rate, now)
+            return True
+
+    @staticmethod
+    def forget_full_buckets(buckets, capacity, rate, now):
+        for key, (tokens, updated) in list(buckets.items()):
+            if get_bucket_tokens(tokens, updated, capacity, rate, now) >= (
+                capacity
+            ):
+                del buckets[key]
+
+    def count(self, scope, counter):
+        with self.counters_lock:
+            self.counters[scope, counter] += 1
+
+    def get_counters(self, scope):
+        with self.counters_lock:
+            return {
+                counter: self.counters[scope, counter] for counter in COUNTERS
+            }
+
+    def reset(self):
+        for lock, buckets in zip(self.locks, self.buckets):
+            with lock:
+                buckets.clear()
+        with self.counters_lock:
+            self.counters.clear()
+
+
+class SharedMemoryBucketStore:
+    """Token buckets in memory-mapped file shared by worker processes.
+
+    Keys are hashed to fixed amount of slots, so colliding keys share
+    bucket. Stripes are guarded by thread locks and fcntl byte-range
+    locks of the file.
+    """
+
+    slot = struct.Struct('=dd')
+
+    counter = struct.Struct('=q')
+
+    counter_slots = 64
+
+    def __init__(self, path, slots=THROTTLE_STORE_SLOTS,
+                 stripes=THROTTLE_LOCK_STRIPES):
+        self.slots = slots
+        self.counters_offset = slots * self.slot.size
+        size = self.counters_offset + self.counter_slots * self.counter.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)
+        self.memory = mmap.mmap(self.fd, size)
+        self.locks = [threading.Lock() for _ in range(stripes + 1)]
+
+    def locked(self, stripe):
+        return _StripeLock(self.fd, self.locks[stripe], stripe)
+
+    @staticmethod
+    def get_index(key, size):
+        digest = blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % size
+
+    def consume(self, key, capacity, rate):
+        """Take token from bucket of the key, return False if it's empty."""
+        index = self.get_index(key, self.slots)
+        offset = index * self.slot.size
+        with self.locked(index % (len(self.locks) - 1)):
+            tokens, updated = self.slot.unpack_from(self.memory, offset)
+            now = time()
+            tokens = get_bucket_tokens(
+                tokens, updated or None, capacity, rate, now
+            )
+            if tokens < 1:
+                return False
+            self.slot.pack_into(self.memory, offset, tokens - 1, now)
+            return True
+
+    def get_counter_offset(self, scope, counter):
+        return self.counters_offset + self.counter.size * self.get_index(
+            f'{scope}:{counter}', self.counter_slots
+        )
+
+    def count(self, scope, counter):
+        offset = self.get_counter_offset(scope, counter)
+        with self.locked(len(self.locks) - 1):
+            value, = self.counter.unpack_from(self.memory, offset)
+            self.counter.pack_into(self.memory, offset, value + 1)
+
+    def get_counters(self, scope):
+        with self.locked(len(self.locks) - 1):
+            return {
+                counter: self.counter.unpack_from(
+                    self.memory, self.get_counter_offset(scope, counter)
+                )[0]
+                for counter in COUNTERS
+            }
+
+    def reset(self):
+        with self.locked(len(self.locks) - 1):
+            self.memory[:] = bytes(len(self.memory))
+
+
+class _StripeLock:
+
+    def __init__(self, fd, thread_lock, stripe):
+        self.fd = fd
+        self.thread_lock = thread_lock
+        self.stripe = stripe
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, self.stripe)
+        except BaseException:
+            self.thread_lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, self.stripe)
+        finally:
+            self.thread_lock.release()
+
+
+@lru_cache(maxsize=None)
+def get_bucket_store():
+    """Return shared memory store if THROTTLE_STORE_PATH is set."""
+    if THROTTLE_STORE_PATH:
+        return SharedMemoryBucketStore(THROTTLE_STORE_PATH)
+    return InProcessBucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle requests by token buckets of client IP and username.
+
+    Rate of the scope is taken from DEFAULT_THROTTLE_RATES, its number of
+    requests is bucket capacity refilled evenly during its period.
+    """
+
+    scope = None
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            return True
+        num_requests, duration = SimpleRateThrottle.parse_rate(None, rate)
+        self.refill_rate = num_requests / duration
+        store = get_bucket_store()
+        for key in self.get_keys(request):
+            if not store.consume(key, num_requests, self.refill_rate):
+                store.count(self.scope, 'rejected')
+                return False
+        store.count(self.scope, 'admitted')
+        return True
+
+    def get_keys(self, request):
+        keys = [f'{self.scope}:ip:{self.get_ident(request)}']
+        if not isinstance(request.data, Mapping):
+            return keys
+        username = request.data.get('username')
+        if isinstance(username, str) and username:
+            keys.append(f'{self.scope}:username:{username.lower()}')
+        return keys
+
+    def wait(self):
+        return 1 / self.refill_rate
+
+
+class SignUpThrottle(TokenBucketThrottle):
+    scope = 'signup'
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
@@ -1,5 +1,4 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
@@ -13,11 +12,18 @@ from rest_framework.serializers import Serializer
 from rest_framework.status import HTTP_200_OK
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
 
 from api_yamdb.settings import ALLOWED_METHODS
-from .custom_viewset import CreateListDestroyModelViewSet
+from .authentication import RoleAccessToken
+from .custom_viewset import (
+    CachedListMixin,
+    CreateListDestroyModelViewSet,
+    ETagMixin,
+    NestedRouteMixin,
+    ServerTimingMixin,
+)
 from .filters import TitleFilter
+from .pagination import PageNumberOrCursorPagination
 from .permissions import (
     IsAdminOrSuperuser,
     IsAdminOrSuperuserOrReadOnly,
@@ -34,8 +40,10 @@ from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
 )
+from .throttling import SignUpThrottle, TokenThrottle
 from reviews.models import (
     Category,
+    Comment,
     Genre,
     Review,
     Title,
@@ -54,32 +62,35 @@ class CategoryViewSet(CreateListDestroyModelViewSet):
     serializer_class = CategorySerializer
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+    ServerTimingMixin,
+    ETagMixin,
+    NestedRouteMixin,
+    ModelViewSet,
+):
     """A simple ViewSet for comment."""
 
     http_method_names = ALLOWED_METHODS
+    pagination_class = PageNumberOrCursorPagination
+    parent_field = 'review'
+    parent_lookups = {'review_id': 'pk', 'title_id': 'title_id'}
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorOrModeratorOrAdminOrSuperuser,
     )
+    etag_shared_generations = ('users',)
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
 
-    def get_review(self):
-        """Return review instance in case of existing one."""
-        return get_object_or_404(
-            Review, pk=self.kwargs.get('review_id'),
-            title__pk=self.kwargs.get('title_id')
-        )
-
-    def get_queryset(self):
-        """Get comments instances of review."""
-        return self.get_review().comments.all()
+    def get_etag_generation(self):
+        """Return generation of comments of the review."""
+        return f'comments:{self.kwargs.get("review_id")}'
 
     def perform_create(self, serializer: Serializer):
         """Save values for author and review fields."""
         serializer.save(
             author=self.request.user,
-            review=self.get_review()
+            review=self.get_parent()
         )
 
 
@@ -92,47 +103,61 @@ class GenreViewSet(CreateListDestroyModelViewSet):
     serializer_class = GenreSerializer
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(
+    ServerTimingMixin,
+    ETagMixin,
+    NestedRouteMixin,
+    ModelViewSet,
+):
     """A simple ViewSet for reviews."""
 
     http_method_names = ALLOWED_METHODS
+    pagination_class = PageNumberOrCursorPagination
+    parent_field = 'title'
+    parent_lookups = {'title_id': 'pk'}
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorOrModeratorOrAdminOrSuperuser,
     )
+    etag_shared_generations = ('users',)
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
 
-    def get_title(self):
-        """Return title instance in case of existing one."""
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
-
-    def get_queryset(self):
-        """Get reviews instances of title."""
-        return self.get_title().reviews.all()
+    def get_etag_generation(self):
+        """Return generation of reviews of the title."""
+        return f'reviews:{self.kwargs.get("title_id")}'
 
     def perform_create(self, serializer: Serializer):
         """Save values for author and title fields."""
         serializer.save(
             author=self.request.user,
-            title=self.get_title()
+            title=self.get_parent()
         )
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+    ServerTimingMixin,
+    ETagMixin,
+    CachedListMixin,
+    ModelViewSet,
+):
     """A simple ViewSet for title."""
 
+    cache_params = ('page', *TitleFilter.base_filters)
     http_method_names = ALLOWED_METHODS
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAdminOrSuperuserOrReadOnly,)
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    )
+    queryset = Title.objects.order_by('id')
     serializer_class = TitleSerializer
 
+    def get_queryset(self):
+        """Join category and prefetch genres for serialized actions."""
+        queryset = super().get_queryset()
+        if self.action == 'destroy':
+            return queryset
+        return queryset.select_related('category').prefetch_related('genre')
+
     def get_serializer_class(self):
         """Define serializer for different methods."""
         if self.request.method == 'GET':
@@ -143,6 +168,8 @@ class TitleViewSet(ModelViewSet):
 class UserCreateView(APIView):
     """A simple View for creating users."""
 
+    throttle_classes = (SignUpThrottle,)
+
     def post(self, request):
         """Send confirmation code to existing user or create new one."""
         serializer = UserRegistrationSerializer(data=request.data)
@@ -154,13 +181,15 @@ class UserCreateView(APIView):
 class UserGetTokenView(APIView):
     """A simple View for JWT generation."""
 
+    throttle_classes = (TokenThrottle,)
+
     def post(self, request):
         """Generate and return JWT to user."""
         serializer = UserGettingTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         return Response({
             'token': str(
-                AccessToken.for_user(
+                RoleAccessToken.for_user(
                     user=get_object_or_404(
                         User,
                         username=serializer.validated_data.get('username')
@@ -170,7 +199,7 @@ class UserGetTokenView(APIView):
         })
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(ServerTimingMixin, ModelViewSet):
     """A simple ViewSet for user."""
     http_method_names = ALLOWED_METHODS
     filter_backends = (SearchFilter,)
@@ -39,6 +39,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if os.getenv('SERVER_TIMING') == 'True':
+    MIDDLEWARE.insert(0, 'api.middleware.ServerTimingMiddleware')
+
+RECORD_REQUESTS_PATH = os.getenv('RECORD_REQUESTS_PATH')
+
+if RECORD_REQUESTS_PATH:
+    MIDDLEWARE.append('api.middleware.RequestRecordingMiddleware')
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -67,9 +75,43 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
     }
 }
 
+# Applied to every new SQLite connection, SQLITE_TUNING=False turns it off
+
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'journal_mode': 'wal',
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'temp_store': 'memory',
+} if os.getenv('SQLITE_TUNING', 'True') == 'True' else {}
+
+# Read replicas, comma separated paths of SQLite database copies
+
+DATABASE_REPLICAS = [
+    path for path in os.getenv('DATABASE_REPLICAS', '').split(',') if path
+]
+
+REPLICA_DATABASES = []
+
+for number, path in enumerate(DATABASE_REPLICAS, start=1):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{path}?mode=rw',
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(f'replica{number}')
+
+if REPLICA_DATABASES:
+    MIDDLEWARE.append('api.middleware.ReplicaMiddleware')
+
+DATABASE_ROUTERS = ['api.db_routers.ReplicaRouter']
+
 
 # Password validation
 
@@ -116,12 +158,17 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '10/min',
+        'token': '20/min',
+    },
+
 }
 
 # Authentication settings
@@ -131,6 +178,21 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Cache settings
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Throttling settings
+
+THROTTLE_STORE_PATH = os.getenv('THROTTLE_STORE_PATH')
+
 # Email backend settings
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -150,3 +212,21 @@ SLUG_FIELD_MAX_LENGTH = 50
 USERNAME_FIELD_MAX_LENGTH = 150
 
 NO_REPLY = 'yamdb@yandex.ru'
+
+EMAIL_RESEND_TIMEOUT = 60 * 5
+
+EMAIL_SEND_BATCH_SIZE = 100
+
+ROLE_VERSION_CACHE_TIMEOUT = 60
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+RESPONSE_CACHE_REFRESH_TIMEOUT = 30
+
+REPLICA_RETRY_TIMEOUT = 30
+
+REPLICA_STICKY_TIMEOUT = 5
+
+THROTTLE_LOCK_STRIPES = 64
+
+THROTTLE_STORE_SLOTS = 2 ** 16
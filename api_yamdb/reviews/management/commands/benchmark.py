@@ -0,0 +1,321 @@
+import json
+import os
+import re
+import statistics
+from io import StringIO
+from itertools import count
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from api.authentication import RoleAccessToken
+from api.urls import router_v1
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+
+def seed_dataset(size, seed):
+    """Replace database content with generated dataset."""
+    call_command('flush', interactive=False, verbosity=0)
+    titles = max(size // 100, 5)
+    with TemporaryDirectory() as path:
+        call_command(
+            'generate_dataset',
+            '--path', path,
+            '--seed', str(seed),
+            '--users', str(max(size // 10, -(-size // titles), 10)),
+            '--titles', str(titles),
+            '--reviews', str(size),
+            '--comments', str(size),
+            stdout=StringIO(),
+        )
+        call_command('import_csv', '--bulk', '--path', path,
+                     stdout=StringIO())
+
+
+def summarize(timings, queries, sizes):
+    """Return percentiles of request timings in ms with queries and bytes."""
+    percentiles = statistics.quantiles(
+        [timing * 1000 for timing in timings], n=100, method='inclusive'
+    )
+    return {
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+        'queries': max(queries),
+        'bytes': max(sizes),
+        'requests': len(timings),
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Yield endpoints slower or doing more queries than in baseline."""
+    for size, endpoints in results.items():
+        for endpoint, current in endpoints.items():
+            previous = baseline.get(size, {}).get(endpoint)
+            if previous is None:
+                continue
+            if current['queries'] > previous['queries']:
+                yield (
+                    f'{endpoint} ({size}): queries '
+                    f'{previous["queries"]} -> {current["queries"]}'
+                )
+            if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                yield (
+                    f'{endpoint} ({size}): p95 '
+                    f'{previous["p95_ms"]} -> {current["p95_ms"]} ms'
+                )
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Measure latency, queries and response size of API endpoints on '
+        'generated datasets and compare them with baseline.'
+    )
+
+    results_path = 'benchmark/results.json'
+
+    baseline_path = 'benchmark/baseline.json'
+
+    admin_username = 'benchmark_admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default=(1000, 10000),
+            nargs='+',
+            type=int,
+            help='Amounts of generated reviews, one dataset per amount.',
+        )
+        parser.add_argument(
+            '--requests',
+            default=50,
+            type=int,
+            help='Measured requests per endpoint.',
+        )
+        parser.add_argument(
+            '--warmup',
+            default=5,
+            type=int,
+            help='Requests per endpoint made before measuring.',
+        )
+        parser.add_argument(
+            '--seed',
+            default=0,
+            type=int,
+            help='Seed of generated datasets.',
+        )
+        parser.add_argument(
+            '--output',
+            default=self.results_path,
+            help='JSON file for results.',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=self.baseline_path,
+            help='JSON file with results to compare with.',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Write results to baseline file instead of comparing.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            default=0.5,
+            type=float,
+            help='Allowed relative growth of p95 latency.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('Нужно хотя бы два запроса на эндпоинт')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            results = {
+                str(size): self.benchmark_size(
+                    size,
+                    options['seed'],
+                    options['requests'],
+                    options['warmup'],
+                )
+                for size in options['sizes']
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.write_json(options['output'], results)
+        if options['save_baseline']:
+            self.write_json(options['baseline'], results)
+            self.stdout.write(
+                self.style.SUCCESS(f'Baseline saved to {options["baseline"]}.')
+            )
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(
+                self.style.WARNING(
+                    f'Baseline {options["baseline"]} not found, use '
+                    f'--save-baseline to create it.'
+                )
+            )
+            return
+        with open(options['baseline'], encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = list(
+            find_regressions(results, baseline, options['tolerance'])
+        )
+        for regression in regressions:
+            self.stdout.write(self.style.WARNING(regression))
+        if regressions:
+            raise CommandError(f'Найдено регрессий: {len(regressions)}')
+        self.stdout.write(self.style.SUCCESS('No regressions found.'))
+
+    def benchmark_size(self, size, seed, requests, warmup):
+        """Seed dataset of given size and return measurements by endpoint."""
+        seed_dataset(size, seed)
+        admin = User.objects.create(
+            username=self.admin_username,
+            email=f'{self.admin_username}@yamdb.fake',
+            role=User.Roles.ADMIN,
+        )
+        client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(admin)}'
+        )
+        results = {}
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+            },
+        ):
+            for name, method, url, get_data in self.get_endpoints(admin):
+                timings, queries, sizes = [], [], []
+                for attempt in range(warmup + requests):
+                    with CaptureQueriesContext(connection) as context:
+                        started = perf_counter()
+                        response = client.generic(
+                            method,
+                            url,
+                            get_data(),
+                            content_type='application/json',
+                        )
+                        elapsed = perf_counter() - started
+                    if response.status_code >= 400:
+                        raise CommandError(
+                            f'{name} вернул {response.status_code}: '
+                            f'{response.content[:200]}'
+                        )
+                    if attempt >= warmup:
+                        timings.append(elapsed)
+                        queries.append(len(context.captured_queries))
+                        sizes.append(len(response.content))
+                results[name] = summarize(timings, queries, sizes)
+                self.stdout.write(
+                    f'{size} {name}: p50 {results[name]["p50_ms"]} ms, '
+                    f'p95 {results[name]["p95_ms"]} ms, '
+                    f'p99 {results[name]["p99_ms"]} ms, '
+                    f'{results[name]["queries"]} queries, '
+                    f'{results[name]["bytes"]} bytes'
+                )
+        return results
+
+    def get_endpoints(self, admin):
+        """Return name, method, url and payload factory of each endpoint.
+
+        Every GET route of router_v1 is requested for the most commented
+        review and its title, so nested lists are the largest ones.
+        """
+        review = Review.objects.annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', 'id').first()
+        samples = {
+            Category: Category.objects.first(),
+            Comment: review.comments.first(),
+            Genre: Genre.objects.first(),
+            Review: review,
+            Title: review.title,
+            User: admin,
+        }
+        url_kwargs = {'title_id': review.title_id, 'review_id': review.id}
+        endpoints = []
+        for prefix, viewset, basename in router_v1.registry:
+            kwargs = {
+                key: url_kwargs[key]
+                for key in re.compile(prefix).groupindex
+            }
+            model = viewset.serializer_class.Meta.model
+            for route in router_v1.get_routes(viewset):
+                methods = router_v1.get_method_map(viewset, route.mapping)
+                if 'get' not in methods:
+                    continue
+                route_kwargs = dict(kwargs)
+                if '{lookup}' in route.url:
+                    lookup_field = viewset.lookup_field
+                    route_kwargs[lookup_field] = getattr(
+                        samples[model], lookup_field
+                    )
+                name = route.name.format(basename=basename)
+                endpoints.append((
+                    f'GET {name}',
+                    'GET',
+                    reverse(name, kwargs=route_kwargs),
+                    str,
+                ))
+        endpoints.append((
+            'GET titles-list filtered',
+            'GET',
+            f'{reverse("titles-list")}?year_min=1950&year_max=2000'
+            f'&category={samples[Category].slug}',
+            str,
+        ))
+        signups = count()
+
+        def get_signup_data():
+            username = f'benchmark{next(signups)}'
+            return json.dumps(
+                {'username': username, 'email': f'{username}@yamdb.fake'}
+            )
+
+        endpoints.append(
+            ('POST sign_up', 'POST', reverse('sign_up'), get_signup_data)
+        )
+        endpoints.append((
+            'POST get_token',
+            'POST',
+            reverse('get_token'),
+            lambda: json.dumps({
+                'username': admin.username,
+                'confirmation_code': default_token_generator.make_token(
+                    admin
+                ),
+            }),
+        ))
+        return endpoints
+
+    @staticmethod
+    def write_json(path, results):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode='w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
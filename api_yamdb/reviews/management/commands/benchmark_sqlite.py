@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+from collections import Counter
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.test.utils import override_settings
+
+from reviews.models import Genre
+
+
+def read_genres(number, index):
+    list(Genre.objects.order_by('-id')[:20])
+
+
+def add_genre(number, index):
+    Genre.objects.create(
+        name=f'Жанр {number}-{index}', slug=f'benchmark-{number}-{index}'
+    )
+
+
+def repeat_operation(operation, number, duration, reconnect):
+    """Repeat operation for duration, return done and failed amounts."""
+    done = errors = 0
+    deadline = perf_counter() + duration
+    try:
+        while perf_counter() < deadline:
+            try:
+                operation(number, done + errors)
+                done += 1
+            except OperationalError:
+                errors += 1
+            if reconnect:
+                connection.close()
+    finally:
+        connection.close()
+    return done, errors
+
+
+def run_worker(kind, operation, number, options):
+    """Start operations with other workers, add their amounts to counts."""
+    options['barrier'].wait()
+    done, errors = repeat_operation(
+        operation, number, options['duration'], options['reconnect']
+    )
+    with options['lock']:
+        options['counts'][kind] += done
+        options['counts'][f'{kind}_errors'] += errors
+
+
+def run_workload(duration, readers, writers, reconnect=False):
+    """Run reader and writer threads, return their operations and errors.
+
+    Readers list latest genres, writers add genres. With reconnect every
+    operation opens new connection like requests with CONN_MAX_AGE=0.
+    """
+    counts = Counter()
+    options = {
+        'barrier': threading.Barrier(readers + writers),
+        'counts': counts,
+        'duration': duration,
+        'lock': threading.Lock(),
+        'reconnect': reconnect,
+    }
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=('reads', read_genres, number, options),
+        )
+        for number in range(readers)
+    ] + [
+        threading.Thread(
+            target=run_worker,
+            args=('writes', add_genre, number, options),
+        )
+        for number in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        'reads_per_s': round(counts['reads'] / duration, 1),
+        'writes_per_s': round(counts['writes'] / duration, 1),
+        'errors': counts['reads_errors'] + counts['writes_errors'],
+    }
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Compare read and write throughput of SQLite database with and '
+        'without SQLITE_PRAGMAS profile.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--duration',
+            default=5,
+            type=float,
+            help='Seconds of workload per profile.',
+        )
+        parser.add_argument(
+            '--readers',
+            default=4,
+            type=int,
+            help='Threads reading genres.',
+        )
+        parser.add_argument(
+            '--writers',
+            default=2,
+            type=int,
+            help='Threads adding genres.',
+        )
+        parser.add_argument(
+            '--reconnect',
+            action='store_true',
+            help='Open new connection for every operation.',
+        )
+        parser.add_argument(
+            '--output',
+            help='JSON file for results.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Бенчмарк работает только с SQLite')
+        if not settings.SQLITE_PRAGMAS:
+            raise CommandError(
+                'Профиль SQLite выключен, уберите SQLITE_TUNING=False'
+            )
+        results = {}
+        for profile, pragmas in (
+            ('default', {}), ('tuned', settings.SQLITE_PRAGMAS)
+        ):
+            with TemporaryDirectory() as path, override_settings(
+                SQLITE_PRAGMAS=pragmas
+            ):
+                connection.settings_dict['TEST']['NAME'] = os.path.join(
+                    path, 'benchmark.sqlite3'
+                )
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+                try:
+                    connection.close()
+                    results[profile] = run_workload(
+                        options['duration'],
+                        options['readers'],
+                        options['writers'],
+                        options['reconnect'],
+                    )
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+            self.stdout.write(
+                f'{profile}: {results[profile]["reads_per_s"]} reads/s, '
+                f'{results[profile]["writes_per_s"]} writes/s, '
+                f'{results[profile]["errors"]} errors'
+            )
+        if options['output']:
+            with open(options['output'], mode='w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS('Benchmark finished.'))
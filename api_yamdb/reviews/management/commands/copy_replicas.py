@@ -0,0 +1,35 @@
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+
+def copy_database(source, path):
+    """Copy SQLite database of connection to file with backup API."""
+    source.ensure_connection()
+    with closing(sqlite3.connect(path)) as target:
+        source.connection.backup(target)
+
+
+class Command(BaseCommand):
+
+    help = 'Copy primary SQLite database to files of DATABASE_REPLICAS.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Копирование реплик работает только с SQLite')
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('Пути реплик не заданы в DATABASE_REPLICAS')
+        for alias, path in zip(
+            settings.REPLICA_DATABASES, settings.DATABASE_REPLICAS
+        ):
+            connections[alias].close()
+            copy_database(connection, path)
+            self.stdout.write(f'{alias}: {path}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(settings.DATABASE_REPLICAS)} replicas copied.'
+            )
+        )
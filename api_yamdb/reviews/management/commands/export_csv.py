@@ -0,0 +1,139 @@
+import csv
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from reviews.models import ImportedTable
+from .import_csv import Command as ImportCommand
+
+
+class Command(BaseCommand):
+
+    help = 'Export database content to csv files in import_csv format.'
+
+    csv_path = 'export/'
+
+    columns = {
+        'category': ('id', 'name', 'slug'),
+        'genre': ('id', 'name', 'slug'),
+        'users': (
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name',
+        ),
+        'titles': ('id', 'name', 'year', 'category'),
+        'genre_title': ('id', 'title_id', 'genre_id'),
+        'review': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        'comments': ('id', 'review_id', 'text', 'author', 'pub_date'),
+    }
+
+    tables = ImportCommand.tables
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=self.csv_path,
+            help='Directory for exported files.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            default=2000,
+            type=int,
+            help='Rows fetched from database per round trip.',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compress files to <table>.csv.gz.',
+        )
+        parser.add_argument(
+            '--jobs',
+            default=1,
+            type=int,
+            help='Tables written concurrently.',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['path'], exist_ok=True)
+        self.id_offsets = {
+            self.tables[state.name]: state.id_offset
+            for state in ImportedTable.objects.filter(
+                name__in=self.tables
+            ).exclude(id_offset=0)
+        }
+        with ThreadPoolExecutor(max_workers=options['jobs']) as executor:
+            futures = [
+                executor.submit(
+                    self.export_table,
+                    table,
+                    options['path'],
+                    options['chunk_size'],
+                    options['gzip'],
+                )
+                for table in self.tables
+            ]
+            for future in futures:
+                self.print_stats(*future.result())
+
+    def export_table(self, table, path, chunk_size, compress):
+        """Write table rows to csv file iterating over server-side cursor."""
+        started = perf_counter()
+        model = self.tables[table]
+        fields = [
+            model._meta.get_field(column) for column in self.columns[table]
+        ]
+        id_shifts = [self.get_id_shift(model, field) for field in fields]
+        file_path = os.path.join(
+            path, f'{table}.csv.gz' if compress else f'{table}.csv'
+        )
+        rows = 0
+        try:
+            with (gzip.open if compress else open)(
+                file_path, mode='wt', encoding='utf-8', newline=''
+            ) as csvfile:
+                csv_writer = csv.writer(csvfile)
+                csv_writer.writerow(self.columns[table])
+                for values in model._base_manager.order_by('pk').values_list(
+                    *(field.attname for field in fields)
+                ).iterator(chunk_size=chunk_size):
+                    csv_writer.writerow([
+                        self.format_value(value, id_shift)
+                        for value, id_shift in zip(values, id_shifts)
+                    ])
+                    rows += 1
+        finally:
+            connection.close()
+        return table, rows, perf_counter() - started
+
+    def get_id_shift(self, model, field):
+        """Return offset added to csv ids of the field by import_csv."""
+        if field.is_relation:
+            return self.id_offsets.get(field.related_model, 0)
+        if field.primary_key:
+            return self.id_offsets.get(model, 0)
+        return 0
+
+    @staticmethod
+    def format_value(value, id_shift):
+        """Return value in format of import_csv files."""
+        if value is None:
+            return ''
+        if id_shift:
+            return value - id_shift
+        if isinstance(value, datetime):
+            return value.astimezone(timezone.utc).isoformat(
+                timespec='milliseconds'
+            ).replace('+00:00', 'Z')
+        return value
+
+    def print_stats(self, name, rows, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{name}.csv: {rows} rows exported in {elapsed:.2f} s '
+                f'({rows / elapsed if elapsed else rows:.0f} rows/s).'
+            )
+        )
@@ -0,0 +1,240 @@
+import csv
+import os
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import accumulate, islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .export_csv import Command as ExportCommand
+
+FIRST_YEAR = 1900
+
+ANCHOR_DATE = date(2024, 1, 1)
+
+DATES_POOL_SIZE = 10000
+
+TEXTS = (
+    'Ставлю десять звёзд!',
+    'Не понравилось, слишком затянуто.',
+    'Пересматривал несколько раз, каждый раз нахожу что-то новое.',
+    'Классика, которую должен увидеть каждый.',
+    'Средне, на один раз.',
+    'Сюжет предсказуем, но актёры играют отлично.',
+    'Согласен с автором отзыва.',
+    'Ничего подобного, всё было не так!',
+)
+
+
+def zipf_rank(rng, size, exponent):
+    """Return rank from 1 to size with power law probability.
+
+    Uses inverse distribution function of continuous bounded power law,
+    so sampling takes constant time and memory.
+    """
+    if exponent == 1:
+        return min(int(size ** rng.random()), size)
+    power = 1 - exponent
+    return min(
+        int(((size ** power - 1) * rng.random() + 1) ** (1 / power)), size
+    )
+
+
+class Command(BaseCommand):
+
+    help = 'Generate csv files of import_csv format with realistic skew.'
+
+    csv_path = 'generated/'
+
+    chunk_size = 10000
+
+    columns = ExportCommand.columns
+
+    roles = ('user', 'moderator', 'admin')
+
+    role_weights = (97, 2, 1)
+
+    score_cum_weights = tuple(accumulate((2, 1, 2, 3, 5, 8, 14, 20, 22, 23)))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=self.csv_path,
+            help='Directory for generated files.',
+        )
+        parser.add_argument(
+            '--seed',
+            default=0,
+            type=int,
+            help='Seed of random generator, same seed gives same files.',
+        )
+        for table, amount in (
+            ('categories', 10),
+            ('genres', 30),
+            ('users', 10000),
+            ('titles', 1000),
+            ('reviews', 100000),
+            ('comments', 100000),
+        ):
+            parser.add_argument(
+                f'--{table}',
+                default=amount,
+                type=int,
+                help=f'Amount of {table}.',
+            )
+        parser.add_argument(
+            '--zipf-exponent',
+            default=1.1,
+            type=float,
+            help='Skew of reviews per title and comments per review.',
+        )
+        parser.add_argument(
+            '--anchor-date',
+            default=ANCHOR_DATE,
+            type=date.fromisoformat,
+            help=(
+                'Latest publication date and title year, files do not '
+                'depend on the day they are generated.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.exponent = options['zipf_exponent']
+        self.path = options['path']
+        self.anchor_date = options['anchor_date']
+        if self.anchor_date > date.today():
+            raise CommandError('Опорная дата не может быть в будущем')
+        os.makedirs(self.path, exist_ok=True)
+        end = datetime.combine(self.anchor_date, time(), timezone.utc)
+        self.dates = [
+            (end - timedelta(seconds=self.rng.randrange(10 ** 9))).isoformat(
+                timespec='milliseconds'
+            ).replace('+00:00', 'Z')
+            for _ in range(DATES_POOL_SIZE)
+        ]
+        if options['users'] < 1 or options['titles'] < 1:
+            raise CommandError(
+                'Нужен хотя бы один пользователь и произведение'
+            )
+        if options['reviews'] > options['users'] * options['titles']:
+            raise CommandError(
+                'Отзывов больше, чем пар пользователей и произведений'
+            )
+
+        self.write_table('category', self.generate_slugs(
+            'category', options['categories']
+        ))
+        self.write_table('genre', self.generate_slugs(
+            'genre', options['genres']
+        ))
+        self.write_table('users', self.generate_users(options['users']))
+        self.write_table('titles', self.generate_titles(
+            options['titles'], options['categories']
+        ))
+        self.write_table('genre_title', self.generate_genre_titles(
+            options['titles'], options['genres']
+        ))
+        reviews = self.write_table('review', self.generate_reviews(
+            options['titles'], options['users'], options['reviews']
+        ))
+        self.write_table('comments', self.generate_comments(
+            reviews, options['users'], options['comments']
+        ))
+
+    def write_table(self, table, rows):
+        """Write generated rows to csv file by chunks, return rows amount."""
+        started = perf_counter()
+        total = 0
+        file_path = os.path.join(self.path, f'{table}.csv')
+        with open(file_path, mode='w', encoding='utf-8', newline='') as f:
+            csv_writer = csv.writer(f)
+            csv_writer.writerow(self.columns[table])
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                csv_writer.writerows(chunk)
+                total += len(chunk)
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{table}.csv: {total} rows generated in {elapsed:.2f} s '
+                f'({total / elapsed if elapsed else total:.0f} rows/s).'
+            )
+        )
+        return total
+
+    @staticmethod
+    def generate_slugs(name, amount):
+        """Yield categories or genres rows."""
+        for idx in range(1, amount + 1):
+            yield idx, f'{name.capitalize()} {idx}', f'{name}-{idx}'
+
+    def generate_users(self, amount):
+        """Yield users rows, few of them are moderators and admins."""
+        roles = self.rng.choices(self.roles, self.role_weights, k=amount)
+        for idx, role in enumerate(roles, 1):
+            yield (
+                idx, f'user{idx}', f'user{idx}@yamdb.fake', role, '', '', ''
+            )
+
+    def generate_titles(self, amount, categories):
+        """Yield titles rows with years allowed by check_year."""
+        last_year = self.anchor_date.year
+        for idx in range(1, amount + 1):
+            yield (
+                idx,
+                f'Произведение {idx}',
+                self.rng.randint(FIRST_YEAR, last_year),
+                self.rng.randint(1, categories) if categories else '',
+            )
+
+    def generate_genre_titles(self, titles, genres):
+        """Yield from one to three genres of each title."""
+        idx = 0
+        for title_id in range(1, titles + 1 if genres else 1):
+            for genre_id in self.rng.sample(
+                range(1, genres + 1), min(genres, self.rng.randint(1, 3))
+            ):
+                idx += 1
+                yield idx, title_id, genre_id
+
+    def generate_reviews(self, titles, users, amount):
+        """Yield reviews with power law amount per title.
+
+        Title can't get more reviews than there are users, because author
+        can review title only once, so reviews over the cap are spread
+        over the following titles.
+        """
+        weights = [rank ** -self.exponent for rank in range(1, titles + 1)]
+        remaining_weight = sum(weights)
+        idx = 0
+        for title_id, weight in enumerate(weights, 1):
+            count = min(users, round(amount * weight / remaining_weight))
+            amount -= count
+            remaining_weight -= weight
+            scores = self.rng.choices(
+                range(1, 11), cum_weights=self.score_cum_weights, k=count
+            )
+            dates = self.rng.choices(self.dates, k=count)
+            texts = self.rng.choices(TEXTS, k=count)
+            authors = self.rng.sample(range(1, users + 1), count)
+            for row in zip(texts, authors, scores, dates):
+                idx += 1
+                yield (idx, title_id, *row)
+
+    def generate_comments(self, reviews, users, amount):
+        """Yield comments with long tail amount per review."""
+        if not reviews:
+            return
+        dates = self.rng.choices(self.dates, k=min(amount, DATES_POOL_SIZE))
+        for idx in range(1, amount + 1):
+            yield (
+                idx,
+                zipf_rank(self.rng, reviews, self.exponent),
+                self.rng.choice(TEXTS),
+                self.rng.randint(1, users),
+                dates[idx % len(dates)],
+            )
@@ -1,24 +1,156 @@
 import csv
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from graphlib import TopologicalSorter
+from hashlib import blake2b
+from itertools import islice
+from multiprocessing import Manager
+from time import perf_counter
 
+import django
+from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
 
+from api.cache import bump_generation
+from api.signals import CACHE_GENERATIONS
 from reviews.models import (
     Category,
     Comment,
     Genre,
     GenreTitle,
+    ImportedRow,
+    ImportedTable,
     Review,
+    ReviewCommentBaseModel,
     Title,
 )
 
 User = get_user_model()
 
+FINGERPRINT_KEY = '_fingerprint'
+
+
+def get_fingerprint(row):
+    """Return hash of raw csv row values."""
+    return blake2b(
+        json.dumps(row, ensure_ascii=False, sort_keys=True).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def prepare_row(model, row, line):
+    """Return validated csv row values prepared for database by attnames."""
+    values = {}
+    for column, value in row.items():
+        try:
+            field = model._meta.get_field(column)
+        except FieldDoesNotExist:
+            raise CommandError(
+                f'{model._meta.db_table}, строка {line}: неизвестный '
+                f'столбец {column}'
+            )
+        try:
+            if field.is_relation and value == '':
+                value = None
+            else:
+                value = field.to_python(value)
+                if not field.is_relation:
+                    field.run_validators(value)
+            values[field.attname] = field.get_db_prep_save(value, connection)
+        except (TypeError, ValueError, ValidationError) as error:
+            raise CommandError(
+                f'{model._meta.db_table}, строка {line}, '
+                f'поле {column}: {error}'
+            )
+    if issubclass(model, ReviewCommentBaseModel):
+        # Rows are inserted bypassing save copying pub_date for ordering.
+        field = model._meta.get_field('pub_date')
+        values.setdefault(
+            'pub_date',
+            field.get_db_prep_save(field.get_default(), connection),
+        )
+        values['sort_date'] = values['pub_date']
+    return values
+
+
+def read_batches(model_label, file_path, batch_size, fingerprints=False):
+    """Yield batches of prepared rows streaming csv file.
+
+    Each row gets hash of its raw values if fingerprints are requested.
+    """
+    model = apps.get_model(model_label)
+    try:
+        with (gzip.open if file_path.endswith('.gz') else open)(
+            file_path, mode='rt', encoding='utf-8', newline=''
+        ) as csvfile:
+            csv_reader = csv.DictReader(csvfile)
+            line = 0
+            while True:
+                chunk = list(islice(csv_reader, batch_size))
+                if not chunk:
+                    return
+                batch = []
+                for number, row in enumerate(chunk, 1):
+                    values = prepare_row(model, row, line + number)
+                    if fingerprints:
+                        values[FINGERPRINT_KEY] = get_fingerprint(row)
+                    batch.append(values)
+                yield batch
+                line += len(chunk)
+    except FileNotFoundError:
+        raise CommandError(f'Ошибка {file_path} не найден')
+
+
+def parse_table(model_label, file_path, batch_size, fingerprints, queue):
+    """Put parsed batches into queue, finish with None or parsing error.
+
+    Any error is forwarded as CommandError, otherwise the importing process
+    would wait for the rest of the table forever.
+    """
+    try:
+        for batch in read_batches(
+            model_label, file_path, batch_size, fingerprints
+        ):
+            queue.put(batch)
+    except CommandError as error:
+        queue.put(error)
+    except Exception as error:
+        queue.put(CommandError(f'{file_path}: {error!r}'))
+    else:
+        queue.put(None)
+
+
+def drain_queue(queue):
+    """Yield batches from queue filled by parse_table."""
+    for item in iter(queue.get, None):
+        if isinstance(item, CommandError):
+            raise item
+        yield item
+
 
 class Command(BaseCommand):
 
+    help = 'Import database content from static/data/*.csv files.'
+
     csv_path = 'static/data/'
 
+    modes = ('insert', 'upsert')
+
+    queue_size = 4
+
+    parent_groups = {
+        Review: ('reviews', 'title_id'),
+        Comment: ('comments', 'review_id'),
+    }
+
     tables = {
         'category': Category,
         'genre': Genre,
@@ -29,7 +161,78 @@ class Command(BaseCommand):
         'comments': Comment,
     }
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=self.csv_path,
+            help='Directory with csv files.',
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Stream files and insert rows in batches keeping csv ids.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=1000,
+            type=int,
+            help='Rows per INSERT statement in bulk mode.',
+        )
+        parser.add_argument(
+            '--jobs',
+            default=1,
+            type=int,
+            help='Processes parsing csv files concurrently in bulk mode.',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=self.modes,
+            default='insert',
+            help=(
+                'Bulk mode write strategy, upsert skips rows unchanged since '
+                'previous upsert and inserts or updates the others.'
+            ),
+        )
+        parser.add_argument(
+            '--tables',
+            choices=tuple(self.tables),
+            nargs='+',
+            help='Import only given tables in bulk mode.',
+        )
+
     def handle(self, *args, **options):
+        self.csv_path = options['path']
+
+        if options['bulk'] or options['mode'] == 'upsert':
+            if (
+                options['mode'] == 'upsert'
+                and connection.vendor not in ('postgresql', 'sqlite')
+            ):
+                raise CommandError(
+                    f'Режим upsert не поддерживается для {connection.vendor}'
+                )
+            self.id_offsets = {}
+            self.upsert = options['mode'] == 'upsert'
+            load_order = [
+                table for table in self.get_load_order()
+                if not options['tables'] or table in options['tables']
+            ]
+            if options['jobs'] > 1:
+                self.parallel_import(
+                    load_order, options['batch_size'], options['jobs']
+                )
+                return
+            for table in load_order:
+                self.bulk_import(
+                    table,
+                    read_batches(
+                        self.tables[table]._meta.label,
+                        self.get_file_path(table),
+                        options['batch_size'],
+                        self.upsert,
+                    ),
+                )
+            return
 
         for table in self.tables:
 
@@ -52,6 +255,307 @@ class Command(BaseCommand):
                     table=table,
                 )
 
+    def get_file_path(self, table):
+        """Return path to csv file of the table, compressed one if exists."""
+        file_path = f'{self.csv_path}/{table}.csv'
+        if not os.path.exists(file_path) and os.path.exists(f'{file_path}.gz'):
+            return f'{file_path}.gz'
+        return file_path
+
+    def get_load_order(self):
+        """Return tables sorted by dependency graph of model foreign keys.
+
+        Models sharing parent table depend on siblings listed before them,
+        because their csv ids are shifted past siblings ones.
+        """
+        table_names = {model: table for table, model in self.tables.items()}
+        siblings = {}
+        graph = TopologicalSorter()
+        for table, model in self.tables.items():
+            dependencies = {
+                table_names[field.related_model]
+                for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model in table_names
+            }
+            for parent in model._meta.get_parent_list():
+                dependencies.update(siblings.setdefault(parent, []))
+                siblings[parent].append(table)
+            graph.add(table, *dependencies)
+        return list(graph.static_order())
+
+    def parallel_import(self, load_order, batch_size, jobs):
+        """Parse csv files in process pool, write them in dependency order."""
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=django.setup
+        ) as executor:
+            with Manager() as manager:
+                queues = {}
+                for table in load_order:
+                    queues[table] = manager.Queue(maxsize=self.queue_size)
+                    executor.submit(
+                        parse_table,
+                        self.tables[table]._meta.label,
+                        self.get_file_path(table),
+                        batch_size,
+                        self.upsert,
+                        queues[table],
+                    )
+                for table in load_order:
+                    self.bulk_import(table, drain_queue(queues[table]))
+
+    def bulk_import(self, table, batches):
+        """Write batches of csv rows into model tables in one transaction."""
+        model = self.tables[table]
+        started = perf_counter()
+        counters = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        group, parent_attname = self.parent_groups.get(model, (None, None))
+        affected_parents = set()
+        changed_users = set()
+
+        with transaction.atomic():
+            state = self.get_table_state(table, model)
+            self.id_offsets[model] = state.id_offset
+            id_shifts = self.get_id_shifts(model)
+            for batch in batches:
+                if not self.upsert:
+                    self.insert_rows(model, self.shift_ids(batch, id_shifts))
+                    counters['inserted'] += len(batch)
+                    if group:
+                        affected_parents.update(
+                            row[parent_attname] for row in batch
+                        )
+                    continue
+                known_rows = self.get_known_rows(state, batch)
+                changed = [
+                    row for row in batch
+                    if getattr(known_rows.get(row['id']), 'fingerprint', None)
+                    != row[FINGERPRINT_KEY]
+                ]
+                counters['unchanged'] += len(batch) - len(changed)
+                if not changed:
+                    continue
+                fingerprints = {
+                    row['id']: row.pop(FINGERPRINT_KEY) for row in changed
+                }
+                self.shift_ids(changed, id_shifts)
+                self.check_parent_ids(table, model, changed)
+                if group:
+                    affected_parents.update(
+                        row[parent_attname] for row in changed
+                    )
+                    affected_parents.update(
+                        model.objects.filter(
+                            pk__in=[row['id'] for row in changed]
+                        ).values_list(parent_attname, flat=True)
+                    )
+                self.insert_rows(model, changed, upsert=True)
+                if model is User:
+                    changed_users.update(fingerprints)
+                self.save_fingerprints(
+                    state, known_rows, fingerprints, counters
+                )
+            self.reset_sequences(model)
+            if model is Review and not self.upsert:
+                Title.refresh_rating()
+            elif model is Review and affected_parents:
+                Title.refresh_rating(
+                    Title.objects.filter(pk__in=affected_parents)
+                )
+        # Rows are written bypassing model signals invalidating responses.
+        bump_generation(
+            *CACHE_GENERATIONS.get(model, ()),
+            *(f'{group}:{parent_id}' for parent_id in affected_parents),
+            # Usernames of upserted users are shown in reviews and comments.
+            *(('users',) if changed_users else ()),
+        )
+        cache.delete_many(
+            [User.get_role_version_key(user_id) for user_id in changed_users]
+        )
+
+        self.print_stats(table, counters, perf_counter() - started)
+
+    def get_table_state(self, table, model):
+        """Return import state of the table, create it on first import.
+
+        Category and genre, review and comment have common parent tables,
+        so the second imported model can't keep ids from csv file and they
+        are shifted past sibling ones once for all following imports.
+        """
+        state = ImportedTable.objects.filter(name=table).first()
+        if state is not None:
+            return state
+        parents = model._meta.get_parent_list()
+        offset = 0
+        if parents and not model._base_manager.exists():
+            offset = parents[-1]._base_manager.aggregate(
+                max_id=Max('pk')
+            )['max_id'] or 0
+        if offset:
+            self.stdout.write(
+                self.style.WARNING(f'{table}.csv: ids shifted by {offset}.')
+            )
+        return ImportedTable.objects.create(name=table, id_offset=offset)
+
+    def get_id_shifts(self, model):
+        """Return offsets of model primary and foreign keys attnames."""
+        id_shifts = {}
+        for field in model._meta.concrete_fields:
+            if field.remote_field and field.remote_field.parent_link:
+                continue
+            if field.is_relation:
+                offset = self.id_offsets.get(field.related_model)
+            else:
+                offset = field.primary_key and self.id_offsets[model]
+            if offset:
+                id_shifts[field.attname] = offset
+        return id_shifts
+
+    @staticmethod
+    def shift_ids(rows, id_shifts):
+        """Shift ids of prepared rows in place."""
+        for row in rows:
+            for attname, offset in id_shifts.items():
+                if row.get(attname) is not None:
+                    row[attname] += offset
+        return rows
+
+    @staticmethod
+    def get_known_rows(state, batch):
+        """Return fingerprints of previously upserted batch rows by ids."""
+        return {
+            known_row.row_id: known_row
+            for known_row in state.rows.filter(
+                row_id__in=[row['id'] for row in batch]
+            )
+        }
+
+    @staticmethod
+    def save_fingerprints(state, known_rows, fingerprints, counters):
+        """Store fingerprints of upserted rows, count inserts and updates."""
+        new_rows = []
+        updated_rows = []
+        for row_id, fingerprint in fingerprints.items():
+            if row_id in known_rows:
+                known_rows[row_id].fingerprint = fingerprint
+                updated_rows.append(known_rows[row_id])
+            else:
+                new_rows.append(
+                    ImportedRow(
+                        fingerprint=fingerprint, row_id=row_id, table=state
+                    )
+                )
+        ImportedRow.objects.bulk_create(new_rows)
+        ImportedRow.objects.bulk_update(updated_rows, ('fingerprint',))
+        counters['inserted'] += len(new_rows)
+        counters['updated'] += len(updated_rows)
+
+    @staticmethod
+    def check_parent_ids(table, model, rows):
+        """Raise error if parent rows of ids belong to sibling model."""
+        parents = model._meta.get_parent_list()
+        if not parents:
+            return
+        ids = [row['id'] for row in rows]
+        taken_ids = parents[-1]._base_manager.filter(pk__in=ids).exclude(
+            pk__in=model._base_manager.filter(pk__in=ids).values('pk')
+        ).values_list('pk', flat=True)[:10]
+        if taken_ids:
+            raise CommandError(
+                f'{table}.csv: идентификаторы {list(taken_ids)} заняты '
+                f'записями другой таблицы'
+            )
+
+    @staticmethod
+    def column_value(field, row):
+        """Return row value for table column, default one if it is absent."""
+        if field.remote_field and field.remote_field.parent_link:
+            return row[field.target_field.attname]
+        if field.attname in row:
+            return row[field.attname]
+        return field.get_db_prep_save(field.get_default(), connection)
+
+    def insert_rows(self, model, rows, upsert=False):
+        """Insert prepared rows into every concrete table of the model.
+
+        In upsert mode rows with existing primary keys get csv columns
+        updated, the other columns are kept.
+        """
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for concrete_model in (
+                *reversed(model._meta.get_parent_list()), model
+            ):
+                fields = concrete_model._meta.local_concrete_fields
+                sql = 'INSERT INTO {table} ({columns}) VALUES ({values})'
+                updated_columns = [
+                    quote_name(field.column) for field in fields
+                    if field.attname in rows[0] and not field.primary_key
+                ]
+                if upsert:
+                    assignments = [
+                        f'{column} = EXCLUDED.{column}'
+                        for column in updated_columns
+                    ] + self.get_role_version_bump(
+                        concrete_model, updated_columns
+                    )
+                    sql += ' ON CONFLICT ({pk}) DO {action}'.format(
+                        pk=quote_name(concrete_model._meta.pk.column),
+                        action='UPDATE SET {}'.format(', '.join(assignments))
+                        if updated_columns else 'NOTHING',
+                    )
+                cursor.executemany(
+                    sql.format(
+                        table=quote_name(concrete_model._meta.db_table),
+                        columns=', '.join(
+                            quote_name(field.column) for field in fields
+                        ),
+                        values=', '.join(['%s'] * len(fields)),
+                    ),
+                    [
+                        [self.column_value(field, row) for field in fields]
+                        for row in rows
+                    ],
+                )
+
+    @staticmethod
+    def get_role_version_bump(model, updated_columns):
+        """Return assignment bumping user role version if access changes.
+
+        Upserted rows bypass User.save, which bumps it otherwise, and
+        tokens issued before the change must be rejected.
+        """
+        if model is not User:
+            return []
+        quote_name = connection.ops.quote_name
+        table = quote_name(model._meta.db_table)
+        access_columns = [
+            quote_name(model._meta.get_field(name).column)
+            for name in model.access_fields
+        ]
+        changed = ' OR '.join(
+            f'{table}.{column} <> EXCLUDED.{column}'
+            for column in access_columns if column in updated_columns
+        )
+        if not changed:
+            return []
+        version = quote_name(model._meta.get_field('role_version').column)
+        return [
+            f'{version} = CASE WHEN {changed} THEN {table}.{version} + 1 '
+            f'ELSE {table}.{version} END'
+        ]
+
+    @staticmethod
+    def reset_sequences(model):
+        """Move primary key sequences past imported ids."""
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(),
+            [*model._meta.get_parent_list(), model],
+        )
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+
     def create_object(self, cls, csv_data, table):
         for obj in csv_data:
             if any(
@@ -70,7 +574,7 @@ class Command(BaseCommand):
                     score=obj['score'],
                     title=title,
                     text=obj['text'],
-                ).save()
+                )
                 self.print_info(table)
             elif table == 'genre_title':
 
@@ -80,7 +584,7 @@ class Command(BaseCommand):
                 GenreTitle.objects.create(
                     genre=genre,
                     title=title,
-                ).save()
+                )
                 self.print_info(table)
             elif table == 'titles':
 
@@ -90,7 +594,7 @@ class Command(BaseCommand):
                     category=category,
                     name=obj['name'],
                     year=obj['year'],
-                ).save()
+                )
                 self.print_info(table)
             elif table == 'comments':
 
@@ -102,7 +606,7 @@ class Command(BaseCommand):
                     pub_date=obj['pub_date'],
                     review=review,
                     text=obj['text'],
-                ).save()
+                )
                 self.print_info(table)
 
     def print_info(self, name):
@@ -111,3 +615,17 @@ class Command(BaseCommand):
                 f'{name}.cvs has been successfully import into revievs_{name}.'
             )
         )
+
+    def print_stats(self, name, counters, elapsed):
+        rows = sum(counters.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{name}.csv: {rows} rows processed in {elapsed:.2f} s '
+                f'({rows / elapsed if elapsed else rows:.0f} rows/s), '
+                + ', '.join(
+                    f'{counter} {value}' for counter, value in counters.items()
+                    if value or counter == 'inserted'
+                )
+                + '.'
+            )
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import bump_generation
+from reviews.search import (
+    create_search_index,
+    is_search_index_supported,
+    rebuild_search_index,
+)
+
+
+class Command(BaseCommand):
+
+    help = 'Recreate full-text index of titles from current data.'
+
+    def handle(self, *args, **options):
+        if not is_search_index_supported():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite'
+            )
+        with transaction.atomic():
+            create_search_index()
+            rebuild_search_index()
+        bump_generation('titles')
+        self.stdout.write(self.style.SUCCESS('Title search index rebuilt.'))
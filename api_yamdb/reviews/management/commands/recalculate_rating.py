@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from api.cache import bump_generation
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+
+    help = 'Rebuild titles rating aggregate from reviews and report drift.'
+
+    batch_size = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without updating titles.',
+        )
+
+    def handle(self, *args, **options):
+        aggregates = {
+            row['title_id']: (row['total'], row['count'])
+            for row in Review.objects.order_by().values('title_id').annotate(
+                count=Count('pk'),
+                total=Sum('score'),
+            )
+        }
+        drifted = []
+        titles = Title.objects.only('rating_count', 'rating_sum').iterator()
+
+        for title in titles:
+            rating_sum, rating_count = aggregates.get(title.pk, (0, 0))
+            if (title.rating_sum, title.rating_count) == (
+                rating_sum, rating_count
+            ):
+                continue
+            self.stdout.write(
+                self.style.WARNING(
+                    f'Title {title.pk}: sum {title.rating_sum} -> '
+                    f'{rating_sum}, count {title.rating_count} -> '
+                    f'{rating_count}.'
+                )
+            )
+            title.rating_count = rating_count
+            title.rating_sum = rating_sum
+            drifted.append(title)
+
+        if drifted and not options['dry_run']:
+            with transaction.atomic():
+                Title.objects.bulk_update(
+                    drifted,
+                    ('rating_count', 'rating_sum'),
+                    batch_size=self.batch_size,
+                )
+            # Titles are updated bypassing signals invalidating responses.
+            bump_generation('titles')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Drift found in {len(drifted)} titles.'
+                if drifted else 'Rating aggregate is consistent.'
+            )
+        )
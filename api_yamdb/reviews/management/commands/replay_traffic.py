@@ -0,0 +1,351 @@
+import json
+import os
+import re
+import statistics
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit, parse_qs
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import Resolver404, resolve
+
+from api.authentication import RoleAccessToken
+from reviews.models import Review
+from .benchmark import seed_dataset
+
+User = get_user_model()
+
+ROLES = ('user', 'moderator', 'admin', 'superuser')
+
+RECORDING_MIDDLEWARE = 'api.middleware.RequestRecordingMiddleware'
+
+VARIABLE = re.compile(r'\{\{(\w+)\}\}')
+
+
+def convert_postman_collection(collection):
+    """Return replay entries of Postman collection requests.
+
+    Bodies stay raw text with {{variables}}, bearer tokens become roles.
+    """
+    entries = []
+    items = list(collection['item'])
+    while items:
+        item = items.pop(0)
+        if 'item' in item:
+            items[:0] = item['item']
+            continue
+        request = item['request']
+        url = request['url']
+        url = urlsplit(url['raw'] if isinstance(url, dict) else url)
+        role = None
+        auth = request.get('auth') or collection.get('auth') or {}
+        for option in auth.get('bearer', ()):
+            if option['key'] == 'token':
+                role = VARIABLE.sub(r'\1', option['value'])
+                role = role.removesuffix('Token')
+        entries.append({
+            'method': request['method'],
+            'path': url.path,
+            'query': parse_qs(url.query),
+            'body': request.get('body', {}).get('raw') or None,
+            'role': role,
+        })
+    return entries
+
+
+def load_entries(path):
+    """Return entries of JSONL recording or Postman collection file."""
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    try:
+        collection = json.loads(content)
+    except ValueError:
+        collection = None
+    if isinstance(collection, dict) and 'item' in collection:
+        return convert_postman_collection(collection), {
+            variable['key']: variable['value']
+            for variable in collection.get('variable', ())
+        }
+    return [json.loads(line) for line in content.splitlines() if line], {}
+
+
+def get_route(path):
+    try:
+        return resolve(path).view_name
+    except Resolver404:
+        return 'unresolved'
+
+
+def summarize(timings, statuses):
+    """Return percentiles of route latencies in ms and status counts."""
+    timings = [timing * 1000 for timing in timings]
+    percentiles = statistics.quantiles(
+        timings * 2 if len(timings) == 1 else timings,
+        n=100,
+        method='inclusive',
+    )
+    return {
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+        'requests': len(timings),
+        'statuses': dict(sorted(Counter(statuses).items())),
+    }
+
+
+def substitute(text, variables, unresolved):
+    """Return text with {{variables}} replaced, collect unknown ones."""
+    def get_value(match):
+        if match[1] not in variables:
+            unresolved.add(match[1])
+            return match[0]
+        return str(variables[match[1]])
+    return VARIABLE.sub(get_value, text)
+
+
+def send_entry(entry, url, tokens, variables, unresolved):
+    """Send entry to server at url, return its route, latency and status."""
+    path = substitute(entry['path'], variables, unresolved)
+    query = urlencode(
+        {
+            key: [
+                substitute(str(value), variables, unresolved)
+                for value in values
+            ]
+            for key, values in entry['query'].items()
+        },
+        doseq=True,
+    )
+    body = entry['body']
+    if body is not None:
+        body = substitute(
+            body if isinstance(body, str) else json.dumps(body),
+            variables,
+            unresolved,
+        ).encode()
+    headers = {'Content-Type': 'application/json'}
+    if entry['role'] in tokens:
+        headers['Authorization'] = f'Bearer {tokens[entry["role"]]}'
+    request = Request(
+        f'{url}{path}?{query}' if query else f'{url}{path}',
+        data=body,
+        headers=headers,
+        method=entry['method'],
+    )
+    started = perf_counter()
+    try:
+        with urlopen(request) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        error.read()
+        status = error.code
+    elapsed = perf_counter() - started
+    return f'{entry["method"]} {get_route(path)}', elapsed, status
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Replay recorded requests or Postman collection against test '
+        'server and report latency by route.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='JSONL file of RequestRecordingMiddleware or Postman '
+                 'collection.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            default=4,
+            type=int,
+            help='Requests sent in parallel.',
+        )
+        parser.add_argument(
+            '--repeat',
+            default=1,
+            type=int,
+            help='Times the requests are replayed.',
+        )
+        parser.add_argument(
+            '--size',
+            default=1000,
+            type=int,
+            help='Amount of reviews in generated dataset, 0 to skip it.',
+        )
+        parser.add_argument(
+            '--seed',
+            default=0,
+            type=int,
+            help='Seed of generated dataset.',
+        )
+        parser.add_argument(
+            '--output',
+            help='JSON file for results.',
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('Параллельность должна быть не меньше 1')
+        entries, variables = load_entries(options['path'])
+        entries *= options['repeat']
+        with TemporaryDirectory() as path:
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = os.path.join(
+                    path, 'replay.sqlite3'
+                )
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                if options['size']:
+                    seed_dataset(options['size'], options['seed'])
+                tokens = self.create_users()
+                variables.update(self.get_variables())
+                with override_settings(
+                    MIDDLEWARE=[
+                        middleware for middleware in settings.MIDDLEWARE
+                        if middleware != RECORDING_MIDDLEWARE
+                    ],
+                    REST_FRAMEWORK={
+                        **settings.REST_FRAMEWORK,
+                        'DEFAULT_THROTTLE_RATES': {},
+                    },
+                ):
+                    results = self.replay_on_server(
+                        entries, options['concurrency'], tokens, variables
+                    )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        for route, result in results.items():
+            self.stdout.write(
+                f'{route}: {result["requests"]} requests, '
+                f'p50 {result["p50_ms"]} ms, p95 {result["p95_ms"]} ms, '
+                f'p99 {result["p99_ms"]} ms, statuses {result["statuses"]}'
+            )
+        if options['output']:
+            with open(options['output'], mode='w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(entries)} requests replayed.')
+        )
+
+    @staticmethod
+    def create_users():
+        """Create user of each role and return their access tokens."""
+        tokens = {}
+        for role in ROLES:
+            user = User.objects.create(
+                username=f'replay_{role}',
+                email=f'replay_{role}@yamdb.fake',
+                role=User.Roles.ADMIN if role == 'superuser' else role,
+                is_superuser=role == 'superuser',
+            )
+            tokens[role] = str(RoleAccessToken.for_user(user))
+        return tokens
+
+    @staticmethod
+    def get_variables():
+        """Return values of Postman variables like adminTitle or userEmail.
+
+        Objects ids point to the most commented review and its title.
+        """
+        variables = {}
+        review = Review.objects.annotate(
+            comments_count=Count('comments')
+        ).order_by('-comments_count', 'id').select_related(
+            'title__category'
+        ).first()
+        samples = {}
+        if review is not None:
+            title = review.title
+            genre = title.genre.first()
+            comment = review.comments.first()
+            samples = {
+                'Title': title.id,
+                'ShortTitle': title.id,
+                'TitleName': title.name,
+                'TitleYear': title.year,
+                'Review': review.id,
+                'Category': title.category and title.category.slug,
+                'Genre': genre and genre.slug,
+                'Comment': comment and comment.id,
+            }
+        for role in ROLES:
+            variables[f'{role}Username'] = f'replay_{role}'
+            variables[f'{role}Email'] = f'replay_{role}@yamdb.fake'
+            for suffix, value in samples.items():
+                if value is not None:
+                    variables[f'{role}{suffix}'] = value
+        return variables
+
+    def replay_on_server(self, entries, concurrency, tokens, variables):
+        """Start threaded server on free port and replay entries to it."""
+        server = ThreadedWSGIServer(('localhost', 0), QuietRequestHandler)
+        server.set_app(WSGIHandler())
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            return self.replay(
+                entries,
+                f'http://localhost:{server.server_port}',
+                concurrency,
+                tokens,
+                variables,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+    def replay(self, entries, url, concurrency, tokens, variables):
+        """Send entries to server at url and return results by route."""
+        unresolved = set()
+        send = partial(
+            send_entry,
+            url=url,
+            tokens=tokens,
+            variables=variables,
+            unresolved=unresolved,
+        )
+        timings, statuses = defaultdict(list), defaultdict(list)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for route, elapsed, status in executor.map(send, entries):
+                timings[route].append(elapsed)
+                statuses[route].append(status)
+        if unresolved:
+            self.stdout.write(self.style.WARNING(
+                f'Unresolved variables: {", ".join(sorted(unresolved))}'
+            ))
+        return {
+            route: summarize(timings[route], statuses[route])
+            for route in sorted(timings)
+        }
@@ -0,0 +1,42 @@
+# Generated by Django 3.2 on 2026-10-17 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating_aggregate(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    aggregates = Review.objects.values('title_id').annotate(
+        count=Count('pk'),
+        total=Sum('score'),
+    )
+    for aggregate in aggregates:
+        Title.objects.filter(pk=aggregate['title_id']).update(
+            rating_count=aggregate['count'],
+            rating_sum=aggregate['total'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_Add_comment_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(
+            fill_rating_aggregate,
+            migrations.RunPython.noop,
+        ),
+    ]
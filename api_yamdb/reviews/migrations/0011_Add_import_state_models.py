@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-17 19:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_Add_review_comment_ordering'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('id_offset', models.BigIntegerField(default=0, verbose_name='Сдвиг идентификаторов')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Таблица')),
+            ],
+            options={
+                'verbose_name': 'Импортированная таблица',
+                'verbose_name_plural': 'Импортированные таблицы',
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32, verbose_name='Отпечаток строки')),
+                ('row_id', models.BigIntegerField(verbose_name='Идентификатор строки')),
+                ('table', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='reviews.importedtable', verbose_name='Таблица')),
+            ],
+            options={
+                'verbose_name': 'Импортированная строка',
+                'verbose_name_plural': 'Импортированные строки',
+                'default_related_name': 'rows',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedrow',
+            constraint=models.UniqueConstraint(fields=('table', 'row_id'), name='unique_table_row'),
+        ),
+    ]
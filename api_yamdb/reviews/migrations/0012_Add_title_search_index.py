@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-17 21:10
+
+from django.db import migrations
+
+from reviews.search import (
+    create_search_index,
+    drop_search_index,
+    rebuild_search_index,
+)
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor.connection)
+    rebuild_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_Add_import_state_models'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-17 19:31
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicates(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    for duplicate in GenreTitle.objects.values('title', 'genre').annotate(
+        first_id=Min('id'), rows=Count('id')
+    ).filter(rows__gt=1):
+        GenreTitle.objects.filter(
+            title=duplicate['title'], genre=duplicate['genre']
+        ).exclude(id=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_Add_title_year_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2 on 2026-10-17 21:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.utils.timezone
+
+
+def copy_pub_date(apps, schema_editor):
+    ReviewCommentBaseModel = apps.get_model(
+        'reviews', 'ReviewCommentBaseModel'
+    )
+    pub_date = ReviewCommentBaseModel.objects.filter(
+        pk=OuterRef('pk')
+    ).values('pub_date')
+    for model_name in ('Review', 'Comment'):
+        apps.get_model('reviews', model_name).objects.update(
+            sort_date=Subquery(pub_date)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_Add_genre_title_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reviewcommentbasemodel',
+            name='pub_date',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='sort_date',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации для сортировки'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='sort_date',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации для сортировки'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_pub_date, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'default_related_name': 'comments', 'ordering': ('sort_date', 'pk'), 'verbose_name': 'Комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+        migrations.AlterModelOptions(
+            name='review',
+            options={'default_related_name': 'reviews', 'ordering': ('sort_date', 'pk'), 'verbose_name': 'Отзыв', 'verbose_name_plural': 'Отзывы'},
+        ),
+        migrations.RemoveIndex(
+            model_name='reviewcommentbasemodel',
+            name='pub_date_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'sort_date', 'reviewcommentbasemodel_ptr'], name='comment_review_sort_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'sort_date', 'reviewcommentbasemodel_ptr'], name='review_title_sort_date_idx'),
+        ),
+    ]
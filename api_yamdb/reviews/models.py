@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
 
 from api_yamdb.settings import (
@@ -76,6 +79,16 @@ class Title(models.Model):
         max_length=CHAR_FIELD_MAX_LENGTH,
         verbose_name='Название произведения',
     )
+    rating_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
+    )
+    rating_sum = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
     year = models.SmallIntegerField(
         help_text='Допускается только текущий год или предшествующие.',
         validators=[
@@ -86,6 +99,12 @@ class Title(models.Model):
 
     class Meta:
         default_related_name = 'titles'
+        indexes = (
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+        )
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -93,6 +112,39 @@ class Title(models.Model):
         """Returns text representation of the class."""
         return f'{self.name} {self.year} year'
 
+    @property
+    def rating(self):
+        """Returns average score of title reviews or None without ones."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def shift_rating(cls, title_id, score_delta, count_delta):
+        """Atomically shifts title rating aggregate by given deltas."""
+        cls.objects.filter(pk=title_id).update(
+            rating_count=F('rating_count') + count_delta,
+            rating_sum=F('rating_sum') + score_delta,
+        )
+
+    @classmethod
+    def refresh_rating(cls, queryset=None):
+        """Rebuilds rating aggregate of titles with single update query."""
+        reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+        reviews = reviews.values('title')
+        if queryset is None:
+            queryset = cls.objects.all()
+        return queryset.update(
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(value=Count('pk')).values('value')),
+                0,
+            ),
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(value=Sum('score')).values('value')),
+                0,
+            ),
+        )
+
 
 class GenreTitle(models.Model):
     """Describes cross table for genre and title models."""
@@ -109,6 +161,12 @@ class GenreTitle(models.Model):
     )
 
     class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'),
+                name='unique_title_genre'
+            ),
+        )
         verbose_name = 'Связь жанр-название'
         verbose_name_plural = 'Связи жанры-названия'
 
@@ -118,10 +176,15 @@ class GenreTitle(models.Model):
 
 
 class ReviewCommentBaseModel(models.Model):
-    """Describes review and comment base model."""
+    """Describes review and comment base model.
+
+    Child models keep copy of pub_date in sort_date, so their listings
+    seek by (parent, sort_date) index of their own table.
+    """
 
     pub_date = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name='Дата публикации',
     )
     text = models.TextField()
@@ -130,6 +193,11 @@ class ReviewCommentBaseModel(models.Model):
         """Returns text representation of the class."""
         return self.text
 
+    def save(self, *args, **kwargs):
+        """Copies publication date to the child model table."""
+        self.sort_date = self.pub_date
+        super().save(*args, **kwargs)
+
 
 class Review(ReviewCommentBaseModel):
     """Describes review model."""
@@ -144,6 +212,10 @@ class Review(ReviewCommentBaseModel):
             check_rate,
         ],
     )
+    sort_date = models.DateTimeField(
+        editable=False,
+        verbose_name='Дата публикации для сортировки',
+    )
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -152,6 +224,7 @@ class Review(ReviewCommentBaseModel):
 
     class Meta:
         default_related_name = 'reviews'
+        ordering = ('sort_date', 'pk')
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         constraints = (
@@ -160,6 +233,38 @@ class Review(ReviewCommentBaseModel):
                 name='unique_author_title'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'sort_date', 'reviewcommentbasemodel_ptr'),
+                name='review_title_sort_date_idx',
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers loaded title and score to track rating changes."""
+        instance = super().from_db(db, field_names, values)
+        instance._rating_snapshot = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Saves review and keeps title rating aggregate up to date."""
+        adding = self._state.adding
+        snapshot = getattr(self, '_rating_snapshot', None)
+        with transaction.atomic():
+            if not adding and snapshot is None:
+                snapshot = Review.objects.filter(pk=self.pk).values_list(
+                    'title_id', 'score'
+                ).first()
+            super().save(*args, **kwargs)
+            if adding or snapshot is None:
+                Title.shift_rating(self.title_id, self.score, 1)
+            elif snapshot[0] != self.title_id:
+                Title.shift_rating(snapshot[0], -snapshot[1], -1)
+                Title.shift_rating(self.title_id, self.score, 1)
+            elif snapshot[1] != self.score:
+                Title.shift_rating(self.title_id, self.score - snapshot[1], 0)
+        self._rating_snapshot = (self.title_id, self.score)
 
 
 class Comment(ReviewCommentBaseModel):
@@ -175,8 +280,73 @@ class Comment(ReviewCommentBaseModel):
         on_delete=models.CASCADE,
         verbose_name='Отзыв'
     )
+    sort_date = models.DateTimeField(
+        editable=False,
+        verbose_name='Дата публикации для сортировки',
+    )
 
     class Meta:
         default_related_name = 'comments'
+        ordering = ('sort_date', 'pk')
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'sort_date', 'reviewcommentbasemodel_ptr'),
+                name='comment_review_sort_date_idx',
+            ),
+        )
+
+
+class ImportedTable(models.Model):
+    """Describes csv file loaded by import_csv command."""
+
+    id_offset = models.BigIntegerField(
+        default=0,
+        verbose_name='Сдвиг идентификаторов',
+    )
+    name = models.CharField(
+        max_length=SLUG_FIELD_MAX_LENGTH,
+        unique=True,
+        verbose_name='Таблица',
+    )
+
+    class Meta:
+        verbose_name = 'Импортированная таблица'
+        verbose_name_plural = 'Импортированные таблицы'
+
+    def __str__(self):
+        """Returns text representation of the class."""
+        return self.name
+
+
+class ImportedRow(models.Model):
+    """Describes fingerprint of csv row loaded in upsert mode."""
+
+    fingerprint = models.CharField(
+        max_length=32,
+        verbose_name='Отпечаток строки',
+    )
+    row_id = models.BigIntegerField(
+        verbose_name='Идентификатор строки',
+    )
+    table = models.ForeignKey(
+        ImportedTable,
+        on_delete=models.CASCADE,
+        verbose_name='Таблица',
+    )
+
+    class Meta:
+        default_related_name = 'rows'
+        verbose_name = 'Импортированная строка'
+        verbose_name_plural = 'Импортированные строки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=['table', 'row_id'],
+                name='unique_table_row'
+            ),
+        )
+
+    def __str__(self):
+        """Returns text representation of the class."""
+        return f'{self.table}-{self.row_id}'
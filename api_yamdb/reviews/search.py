@@ -0,0 +1,100 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+TITLE_TABLE = 'reviews_title'
+
+SEARCH_TABLE = 'reviews_title_fts'
+
+CREATE_SEARCH_INDEX = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"name, description, content='{TITLE_TABLE}', content_rowid='id', "
+    f"tokenize='unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert "
+    f"AFTER INSERT ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete "
+    f"AFTER DELETE ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update "
+    f"AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+)
+
+DROP_SEARCH_INDEX = (
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_update',
+    f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+)
+
+
+def is_search_index_supported(db_connection=connection):
+    return db_connection.vendor == 'sqlite'
+
+
+def create_search_index(db_connection=connection):
+    """Create full-text index of titles with triggers keeping it in sync."""
+    if not is_search_index_supported(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        for statement in CREATE_SEARCH_INDEX:
+            cursor.execute(statement)
+
+
+def drop_search_index(db_connection=connection):
+    if not is_search_index_supported(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        for statement in DROP_SEARCH_INDEX:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(db_connection=connection):
+    """Fill full-text index with current titles."""
+    if not is_search_index_supported(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def search_titles(queryset, value):
+    """Filter titles by words prefixes ordering them by relevance.
+
+    Without full-text index falls back to substring match of name and
+    description.
+    """
+    words = re.findall(r'\w+', value)
+    if not words:
+        return queryset
+    if not is_search_index_supported():
+        condition = Q()
+        for word in words:
+            condition &= Q(name__icontains=word) | Q(
+                description__icontains=word
+            )
+        return queryset.filter(condition)
+    query = ' '.join(f'"{word}"*' for word in words)
+    return queryset.filter(
+        id__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s',
+            (query,),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT rank FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s '
+            f'AND rowid = {TITLE_TABLE}.id',
+            (query,),
+        )
+    ).order_by('search_rank', 'id')
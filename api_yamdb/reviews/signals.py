@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from reviews.models import Review, Title
+
+
+@receiver(post_delete, sender=Review)
+def withdraw_review_score(sender, instance, **kwargs):
+    """Remove deleted review score from title rating aggregate."""
+    title_id, score = getattr(
+        instance,
+        '_rating_snapshot',
+        (instance.title_id, instance.score)
+    )
+    Title.shift_rating(title_id, -score, -1)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from time import sleep
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api_yamdb.settings import (
+    EMAIL_RESEND_TIMEOUT,
+    EMAIL_SEND_BATCH_SIZE,
+    NO_REPLY,
+)
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+
+    help = 'Send emails from outbox in batches over one mail connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=EMAIL_SEND_BATCH_SIZE,
+            type=int,
+            help='Emails sent per transaction.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Keep polling outbox with given pause in seconds.',
+        )
+
+    def handle(self, *args, **options):
+        sent = 0
+        with get_connection() as mail_connection:
+            while True:
+                batch_sent = self.send_batch(
+                    mail_connection, options['batch_size']
+                )
+                sent += batch_sent
+                if batch_sent:
+                    continue
+                self.delete_sent()
+                if options['interval'] is None:
+                    break
+                sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'{sent} emails sent.'))
+
+    @staticmethod
+    def delete_sent():
+        """Delete emails sent longer than EMAIL_RESEND_TIMEOUT ago."""
+        OutgoingEmail.objects.filter(
+            sent__lt=timezone.now() - timedelta(seconds=EMAIL_RESEND_TIMEOUT)
+        ).delete()
+
+    @staticmethod
+    def send_batch(mail_connection, batch_size):
+        """Send batch of unsent emails, return amount of them.
+
+        Emails stay unsent if backend fails, so they are retried later.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.select_for_update(
+                    skip_locked=True
+                ).filter(sent=None).order_by('id')[:batch_size]
+            )
+            if not emails:
+                return 0
+            mail_connection.send_messages([
+                EmailMessage(
+                    body=email.message,
+                    from_email=NO_REPLY,
+                    subject=email.subject,
+                    to=[email.recipient],
+                )
+                for email in emails
+            ])
+            OutgoingEmail.objects.filter(
+                pk__in=[email.pk for email in emails]
+            ).update(sent=timezone.now())
+        return len(emails)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.throttling import get_bucket_store
+from api_yamdb.settings import THROTTLE_STORE_PATH
+
+SCOPES = ('signup', 'token')
+
+
+class Command(BaseCommand):
+
+    help = 'Print amounts of admitted and rejected auth requests.'
+
+    def handle(self, *args, **options):
+        if not THROTTLE_STORE_PATH:
+            raise CommandError(
+                'Счётчики хранятся в памяти процессов приложения, задайте '
+                'THROTTLE_STORE_PATH'
+            )
+        store = get_bucket_store()
+        for scope in SCOPES:
+            counters = store.get_counters(scope)
+            self.stdout.write(
+                f'{scope}: {counters["admitted"]} admitted, '
+                f'{counters["rejected"]} rejected'
+            )
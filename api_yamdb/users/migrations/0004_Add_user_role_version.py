@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_Add_outgoing_email_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия прав доступа'),
+        ),
+    ]
@@ -1,14 +1,51 @@
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as AuthUserManager
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
 
 from api_yamdb.settings import (
+    CHAR_FIELD_MAX_LENGTH,
+    EMAIL_FIELD_MAX_LENGTH,
+    EMAIL_RESEND_TIMEOUT,
+    ROLE_VERSION_CACHE_TIMEOUT,
     SLUG_FIELD_MAX_LENGTH,
     USERNAME_FIELD_MAX_LENGTH,
 )
 from .validators import check_username_for_me_value
 
 
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """Bump role version of users whose access fields are changed."""
+        access = {
+            field: kwargs[field]
+            for field in User.access_fields if field in kwargs
+        }
+        if not access:
+            return super().update(**kwargs)
+        keys = [
+            User.get_role_version_key(user_id)
+            for user_id in self.values_list('pk', flat=True)
+        ]
+        kwargs['role_version'] = Case(
+            When(~Q(**access), then=F('role_version') + 1),
+            default=F('role_version'),
+        )
+        rows = super().update(**kwargs)
+        transaction.on_commit(lambda: cache.delete_many(keys), using=self.db)
+        return rows
+
+
+class UserManager(AuthUserManager.from_queryset(UserQuerySet)):
+    pass
+
+
 class User(AbstractUser):
     """Describes user model."""
 
@@ -32,6 +69,11 @@ class User(AbstractUser):
         max_length=SLUG_FIELD_MAX_LENGTH,
         verbose_name='Уровень доступа',
     )
+    role_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия прав доступа',
+    )
     username = models.CharField(
         max_length=USERNAME_FIELD_MAX_LENGTH,
         unique=True,
@@ -40,9 +82,13 @@ class User(AbstractUser):
             UnicodeUsernameValidator(),
         ])
 
+    access_fields = ('is_active', 'is_superuser', 'role')
+
+    objects = UserManager()
+
     class Meta:
         default_related_name = 'users'
-        ordering = ('username', 'email')
+        ordering = ('username',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
@@ -50,6 +96,52 @@ class User(AbstractUser):
         """Returns text representation of the class."""
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers loaded access fields and username to track changes."""
+        instance = super().from_db(db, field_names, values)
+        if set(cls.access_fields).issubset(field_names):
+            instance._access_snapshot = instance.get_access_snapshot()
+        if 'username' in field_names:
+            instance._loaded_username = instance.username
+        return instance
+
+    def get_access_snapshot(self):
+        return tuple(getattr(self, field) for field in self.access_fields)
+
+    def save(self, *args, **kwargs):
+        """Bump role version if access fields changed."""
+        if (
+            self.pk is not None
+            and getattr(self, '_access_snapshot', None)
+            != self.get_access_snapshot()
+        ):
+            self.role_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'role_version'
+                }
+            key = self.get_role_version_key(self.pk)
+            transaction.on_commit(lambda: cache.delete(key))
+        super().save(*args, **kwargs)
+        self._access_snapshot = self.get_access_snapshot()
+
+    @staticmethod
+    def get_role_version_key(user_id):
+        return f'role_version:{user_id}'
+
+    @classmethod
+    def get_role_version(cls, user_id):
+        """Return role version of active user or None, cached for a while."""
+        key = cls.get_role_version_key(user_id)
+        role_version = cache.get(key)
+        if role_version is None:
+            role_version = cls.objects.filter(
+                pk=user_id, is_active=True
+            ).values_list('role_version', flat=True).first()
+            cache.set(key, role_version, ROLE_VERSION_CACHE_TIMEOUT)
+        return role_version
+
     @property
     def is_moderator(self):
         """Return True if user role is moderator, false otherwise."""
@@ -62,3 +154,65 @@ class User(AbstractUser):
             self.role == 'admin'
             or self.is_superuser
         )
+
+
+class OutgoingEmail(models.Model):
+    """Describes email waiting for delivery by send_emails command."""
+
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+    )
+    message = models.TextField(
+        verbose_name='Текст письма',
+    )
+    recipient = models.EmailField(
+        max_length=EMAIL_FIELD_MAX_LENGTH,
+        verbose_name='Получатель',
+    )
+    sent = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Дата отправки',
+    )
+    subject = models.CharField(
+        max_length=CHAR_FIELD_MAX_LENGTH,
+        verbose_name='Тема письма',
+    )
+
+    class Meta:
+        default_related_name = 'outgoing_emails'
+        indexes = (
+            models.Index(
+                fields=('recipient', 'created'),
+                name='outgoing_email_recipient_idx',
+            ),
+            models.Index(
+                fields=('sent', 'id'),
+                name='outgoing_email_sent_idx',
+            ),
+        )
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        """Returns text representation of the class."""
+        return f'{self.recipient}: {self.subject}'
+
+    @classmethod
+    def enqueue(cls, recipient, subject, message):
+        """Add email to outbox unless recipient got one recently.
+
+        Returns True if email was added.
+        """
+        if cls.objects.filter(
+            recipient=recipient,
+            created__gte=timezone.now() - timedelta(
+                seconds=EMAIL_RESEND_TIMEOUT
+            ),
+        ).exists():
+            return False
+        cls.objects.create(
+            message=message, recipient=recipient, subject=subject
+        )
+        return True
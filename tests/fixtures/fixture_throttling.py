@@ -0,0 +1,10 @@
+import pytest
+
+from api.throttling import get_bucket_store
+
+
+@pytest.fixture(autouse=True)
+def reset_throttling():
+    get_bucket_store().reset()
+    yield
+    get_bucket_store().reset()
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregate:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, title_id):
+        from reviews.models import Title
+        return Title.objects.get(pk=title_id)
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user,
+                                              moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (15, 3), (
+            'Проверьте, что при создании отзыва обновляются поля '
+            '`rating_sum` и `rating_count` произведения.'
+        )
+
+        response = admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что при изменении оценки отзыва обновляется поле '
+            '`rating_sum` произведения.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (7, 2), (
+            'Проверьте, что при удалении отзыва обновляются поля '
+            '`rating_sum` и `rating_count` произведения.'
+        )
+
+        moderator.delete()
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.rating_count) == (2, 1), (
+            'Проверьте, что при каскадном удалении отзывов вместе с '
+            'автором обновляется рейтинг произведения.'
+        )
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') == 2
+
+    def test_02_recalculate_rating_fixes_drift(self, admin_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.filter(pk=titles[0]['id']).update(
+            rating_sum=42, rating_count=7
+        )
+
+        out = StringIO()
+        call_command('recalculate_rating', '--dry-run', stdout=out)
+        assert 'Drift found in 1 titles.' in out.getvalue()
+        assert self.get_title(titles[0]['id']).rating_count == 7
+
+        call_command('recalculate_rating', stdout=StringIO())
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (0, 0), (
+            'Проверьте, что команда `recalculate_rating` пересчитывает '
+            'рейтинг произведений.'
+        )
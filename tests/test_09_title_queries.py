@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    LIST_QUERIES = 3
+
+    def add_titles(self, amount):
+        from reviews.models import Category, Genre, Title
+        category = Category.objects.first()
+        genres = list(Genre.objects.all())
+        for idx in range(amount):
+            title = Title.objects.create(
+                category=category, name=f'title {idx}', year=2000
+            )
+            title.genre.set(genres)
+
+    def test_01_title_list_query_count(self, client, admin_client,
+                                       django_assert_num_queries):
+        create_titles(admin_client)
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        self.add_titles(10)
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == 5, (
+            'Проверьте, что количество SQL-запросов при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от размера страницы.'
+        )
+
+    def test_02_title_detail_and_write_query_count(self, client,
+                                                   admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with CaptureQueriesContext(connection) as detail_queries:
+            client.get(url)
+        assert len(detail_queries) == 2
+
+        counts = []
+        for title in titles:
+            with CaptureQueriesContext(connection) as write_queries:
+                response = admin_client.patch(
+                    self.TITLES_DETAIL_URL_TEMPLATE.format(
+                        title_id=title['id']
+                    ),
+                    data={'name': 'new name'}
+                )
+            assert response.status_code == HTTPStatus.OK
+            assert len(response.json()['genre']) == len(title['genre'])
+            counts.append(len(write_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что количество SQL-запросов при PATCH-запросе к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` не зависит от количества '
+            'жанров произведения.'
+        )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    COMMENTS_AMOUNT = 7
+
+    def create_comments(self, admin_client, admin):
+        from reviews.models import Comment
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        comment_ids = [
+            Comment.objects.create(
+                author=admin, review_id=reviews[0]['id'], text=f'text {idx}'
+            ).id
+            for idx in range(self.COMMENTS_AMOUNT)
+        ]
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        return url, comment_ids, reviews[0]['id']
+
+    def walk_cursor_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что в режиме курсорной пагинации `{url}` '
+                'не возвращает ключ `count`.'
+            )
+            ids.extend(obj['id'] for obj in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_page_number_mode_is_default(self, client, admin_client,
+                                            admin):
+        url, comment_ids, _ = self.create_comments(admin_client, admin)
+        data = client.get(url).json()
+        assert data['count'] == self.COMMENTS_AMOUNT, (
+            f'Проверьте, что `{url}` без параметра `cursor` использует '
+            'постраничную пагинацию.'
+        )
+        data = client.get(f'{url}?page=2').json()
+        assert [obj['id'] for obj in data['results']] == comment_ids[5:], (
+            f'Проверьте, что `{url}` возвращает объекты в порядке '
+            'публикации.'
+        )
+
+    def test_02_cursor_mode(self, client, admin_client, admin):
+        url, comment_ids, review_id = self.create_comments(
+            admin_client, admin
+        )
+        assert self.walk_cursor_pages(client, f'{url}?cursor=') == (
+            comment_ids
+        ), (
+            f'Проверьте, что `{url}` с параметром `cursor` возвращает все '
+            'объекты в порядке публикации.'
+        )
+
+        from reviews.models import Comment
+        first_page = client.get(f'{url}?cursor=').json()
+        new_comment = Comment.objects.create(
+            author=admin, review_id=review_id, text='late comment'
+        )
+        assert self.walk_cursor_pages(client, first_page['next']) == (
+            comment_ids[5:] + [new_comment.id]
+        ), (
+            'Проверьте, что курсорная пагинация стабильна при добавлении '
+            'новых объектов.'
+        )
+
+    def test_03_cursor_page_seeks_index(self, client, admin_client, admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url, _, review_id = self.create_comments(admin_client, admin)
+        title_id = url.split('/')[4]
+        for page_url, index in (
+            (f'/api/v1/titles/{title_id}/reviews/',
+             'review_title_sort_date_idx'),
+            (url, 'comment_review_sort_date_idx'),
+        ):
+            page_url = client.get(f'{page_url}?cursor=').json()['next'] or (
+                f'{page_url}?cursor='
+            )
+            with CaptureQueriesContext(connection) as context:
+                assert client.get(page_url).status_code == HTTPStatus.OK
+            sql = next(
+                query['sql'] for query in context.captured_queries
+                if 'ORDER BY' in query['sql'] and 'sort_date' in query['sql']
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что курсорная страница `{page_url}` читается '
+                f'по индексу без сортировки, план запроса: {plan}'
+            )
@@ -0,0 +1,282 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_csv_rows(table):
+    with open(os.path.join(DATA_PATH, f'{table}.csv'), encoding='utf-8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportCsv:
+
+    def test_01_bulk_import(self, monkeypatch):
+        from reviews.management.commands.import_csv import Command
+        from reviews.models import Comment, Genre, Review, Title
+        monkeypatch.setattr(Command, 'csv_path', DATA_PATH)
+
+        out = StringIO()
+        call_command('import_csv', '--bulk', '--batch-size', '7', stdout=out)
+
+        assert 'rows/s' in out.getvalue(), (
+            'Проверьте, что команда `import_csv --bulk` выводит скорость '
+            'загрузки.'
+        )
+        for model, table in ((Title, 'titles'), (Review, 'review'),
+                             (Comment, 'comments')):
+            assert model.objects.count() == count_csv_rows(table), (
+                f'Проверьте, что команда `import_csv --bulk` загружает все '
+                f'строки файла `{table}.csv`.'
+            )
+        assert Title.objects.get(pk=1).genre.get() == Genre.objects.get(
+            slug='drama'
+        ), (
+            'Проверьте, что команда `import_csv --bulk` сохраняет связи '
+            'произведений и жанров.'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv --bulk` сохраняет дату '
+            'публикации из файла.'
+        )
+
+        out = StringIO()
+        call_command('recalculate_rating', '--dry-run', stdout=out)
+        assert 'Rating aggregate is consistent.' in out.getvalue(), (
+            'Проверьте, что после загрузки отзывов рейтинг произведений '
+            'пересчитан.'
+        )
+
+    def test_02_load_order_follows_foreign_keys(self):
+        from reviews.management.commands.import_csv import Command
+        load_order = Command().get_load_order()
+        dependencies = (
+            ('category', 'titles'),
+            ('category', 'genre'),
+            ('titles', 'genre_title'),
+            ('genre', 'genre_title'),
+            ('users', 'review'),
+            ('titles', 'review'),
+            ('review', 'comments'),
+        )
+        for parent, child in dependencies:
+            assert load_order.index(parent) < load_order.index(child), (
+                f'Проверьте, что таблица `{parent}` загружается раньше '
+                f'зависимой таблицы `{child}`.'
+            )
+
+    def test_03_parallel_bulk_import(self, monkeypatch):
+        from reviews.management.commands.import_csv import Command
+        from reviews.models import Comment, GenreTitle
+        monkeypatch.setattr(Command, 'csv_path', DATA_PATH)
+
+        call_command(
+            'import_csv', '--bulk', '--jobs', '3', '--batch-size', '10',
+            stdout=StringIO()
+        )
+
+        assert Comment.objects.count() == count_csv_rows('comments')
+        assert GenreTitle.objects.count() == count_csv_rows('genre_title'), (
+            'Проверьте, что команда `import_csv --bulk --jobs` загружает '
+            'все таблицы.'
+        )
+
+    def test_04_upsert_mode_applies_only_changes(self, monkeypatch,
+                                                 tmp_path):
+        import shutil
+        from reviews.management.commands.import_csv import Command
+        from reviews.models import Review, Title
+        shutil.copytree(DATA_PATH, tmp_path, dirs_exist_ok=True)
+        monkeypatch.setattr(Command, 'csv_path', str(tmp_path))
+        call_command('import_csv', '--mode', 'upsert', stdout=StringIO())
+
+        review_path = tmp_path / 'review.csv'
+        with open(review_path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        rows[0]['score'] = '1'
+        rows.append(dict(rows[-1], id='1000', author=rows[0]['author']))
+        rows[-1]['title_id'] = Title.objects.exclude(
+            reviews__author_id=rows[0]['author']
+        ).first().pk
+        with open(review_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        out = StringIO()
+        call_command(
+            'import_csv', '--mode', 'upsert', '--tables', 'titles', 'review',
+            stdout=out
+        )
+        assert 'inserted 1, updated 1, unchanged' in out.getvalue(), (
+            'Проверьте, что команда `import_csv --mode upsert` применяет '
+            'только изменённые строки.'
+        )
+        assert Review.objects.get(pk=int(rows[0]['id'])).score == 1
+        assert Review.objects.count() == len(rows)
+
+        out = StringIO()
+        call_command('recalculate_rating', '--dry-run', stdout=out)
+        assert 'Rating aggregate is consistent.' in out.getvalue()
+
+    def test_05_export_round_trip(self, monkeypatch, tmp_path):
+        import gzip
+        from reviews.management.commands.import_csv import Command
+        monkeypatch.setattr(Command, 'csv_path', DATA_PATH)
+        call_command('import_csv', '--bulk', stdout=StringIO())
+
+        out = StringIO()
+        call_command(
+            'export_csv', '--path', str(tmp_path), '--gzip', '--jobs', '3',
+            '--chunk-size', '10', stdout=out
+        )
+        assert 'rows/s' in out.getvalue()
+        for table in Command.tables:
+            with open(
+                os.path.join(DATA_PATH, f'{table}.csv'), encoding='utf-8'
+            ) as f:
+                expected = sorted(
+                    csv.DictReader(f), key=lambda row: int(row['id'])
+                )
+            with gzip.open(
+                tmp_path / f'{table}.csv.gz', 'rt', encoding='utf-8'
+            ) as f:
+                exported = list(csv.DictReader(f))
+            assert exported == expected, (
+                f'Проверьте, что команда `export_csv` выгружает таблицу '
+                f'`{table}` в формате файлов `import_csv`.'
+            )
+
+    def test_06_generated_dataset(self, monkeypatch, tmp_path):
+        from datetime import date, datetime, timedelta
+        from reviews.management.commands import generate_dataset
+        from reviews.models import Comment, Review, Title
+
+        class ShiftedDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return super().now(tz) + timedelta(days=400, hours=5)
+
+        class ShiftedDate(date):
+            @classmethod
+            def today(cls):
+                return super().today() + timedelta(days=400)
+
+        options = (
+            '--users', '50', '--titles', '20', '--reviews', '300',
+            '--comments', '200', '--seed', '7',
+        )
+        for directory in ('first', 'second'):
+            if directory == 'second':
+                monkeypatch.setattr(
+                    generate_dataset, 'datetime', ShiftedDatetime
+                )
+                monkeypatch.setattr(generate_dataset, 'date', ShiftedDate)
+            call_command(
+                'generate_dataset', '--path', str(tmp_path / directory),
+                *options, stdout=StringIO(),
+            )
+        for table in ('users', 'titles', 'review', 'comments'):
+            assert (
+                (tmp_path / 'first' / f'{table}.csv').read_bytes()
+                == (tmp_path / 'second' / f'{table}.csv').read_bytes()
+            ), (
+                'Проверьте, что команда `generate_dataset` с одинаковым '
+                '`--seed` генерирует одинаковые файлы в разные дни.'
+            )
+
+        call_command(
+            'import_csv', '--bulk', '--path', str(tmp_path / 'first'),
+            stdout=StringIO(),
+        )
+
+        assert Title.objects.count() == 20, (
+            'Проверьте, что сгенерированные произведения загружаются '
+            'командой `import_csv`.'
+        )
+        assert Comment.objects.count() == 200, (
+            'Проверьте, что команда `generate_dataset` генерирует заданное '
+            'количество комментариев.'
+        )
+        reviews_per_title = sorted(
+            Title.objects.values_list('rating_count', flat=True),
+            reverse=True,
+        )
+        assert reviews_per_title[0] > 5 * reviews_per_title[-1], (
+            'Проверьте, что количество отзывов на произведения '
+            'распределено неравномерно.'
+        )
+        assert not Review.objects.exclude(score__range=(1, 10)).exists(), (
+            'Проверьте, что команда `generate_dataset` генерирует оценки '
+            'от 1 до 10.'
+        )
+
+    @pytest.mark.parametrize('jobs', ('1', '2'))
+    def test_07_unknown_column_is_reported(self, monkeypatch, tmp_path,
+                                           jobs):
+        import shutil
+        from django.core.management.base import CommandError
+        from reviews.management.commands.import_csv import Command
+        shutil.copytree(DATA_PATH, tmp_path, dirs_exist_ok=True)
+        monkeypatch.setattr(Command, 'csv_path', str(tmp_path))
+        genre_path = tmp_path / 'genre.csv'
+        with open(genre_path, encoding='utf-8', newline='') as f:
+            rows = [dict(row, extra='1') for row in csv.DictReader(f)]
+        with open(genre_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        with pytest.raises(CommandError, match='extra'):
+            call_command(
+                'import_csv', '--bulk', '--jobs', jobs, stdout=StringIO()
+            )
+
+    def test_08_generated_reviews_amount_is_exact(self, tmp_path):
+        from django.core.management.base import CommandError
+        options = ('--users', '10', '--titles', '5', '--comments', '0')
+        call_command(
+            'generate_dataset', '--path', str(tmp_path), *options,
+            '--reviews', '45', stdout=StringIO(),
+        )
+        with open(tmp_path / 'review.csv', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 45, (
+            'Проверьте, что команда `generate_dataset` генерирует заданное '
+            'количество отзывов, даже если популярным произведениям не '
+            'хватает авторов.'
+        )
+        assert len({(row['title_id'], row['author']) for row in rows}) == 45
+
+        with pytest.raises(CommandError):
+            call_command(
+                'generate_dataset', '--path', str(tmp_path), *options,
+                '--reviews', '51', stdout=StringIO(),
+            )
+
+    def test_09_import_invalidates_only_response_groups(self, monkeypatch):
+        from django.core.cache import cache
+        from api.cache import get_generation
+        from reviews.management.commands.import_csv import Command
+        monkeypatch.setattr(Command, 'csv_path', DATA_PATH)
+        groups = ('titles', 'categories', 'genres', 'reviews:1', 'comments:6')
+        generations = {group: get_generation(group) for group in groups}
+        cache.set('unrelated', 1)
+
+        call_command('import_csv', '--bulk', stdout=StringIO())
+
+        for group in groups:
+            assert get_generation(group) != generations[group], (
+                f'Проверьте, что команда `import_csv` сбрасывает кэш '
+                f'ответов группы `{group}`.'
+            )
+        assert cache.get('unrelated') == 1, (
+            'Проверьте, что команда `import_csv` не очищает весь кэш.'
+        )
@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Benchmark:
+
+    def test_01_benchmark_covers_routes(self):
+        from api.urls import router_v1
+        from reviews.management.commands.benchmark import Command
+
+        results = Command(stdout=StringIO()).benchmark_size(
+            size=300, seed=1, requests=3, warmup=1
+        )
+
+        for _, _, basename in router_v1.registry:
+            assert f'GET {basename}-list' in results, (
+                f'Проверьте, что бенчмарк измеряет эндпоинт `{basename}`.'
+            )
+        for name in ('POST sign_up', 'POST get_token'):
+            assert name in results, (
+                f'Проверьте, что бенчмарк измеряет эндпоинт `{name}`.'
+            )
+        for name, result in results.items():
+            assert (
+                result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+            ), (
+                f'Проверьте перцентили задержки эндпоинта `{name}`.'
+            )
+            assert 'queries' in result and result['bytes'] > 0, (
+                f'Проверьте, что для эндпоинта `{name}` сохраняется '
+                f'количество запросов к базе и размер ответа.'
+            )
+
+    def test_02_find_regressions(self):
+        from reviews.management.commands.benchmark import find_regressions
+        baseline = {'1000': {
+            'GET titles-list': {'p95_ms': 10, 'queries': 4},
+            'GET genres-list': {'p95_ms': 10, 'queries': 3},
+        }}
+        results = {'1000': {
+            'GET titles-list': {'p95_ms': 11, 'queries': 5},
+            'GET genres-list': {'p95_ms': 30, 'queries': 3},
+            'GET users-list': {'p95_ms': 30, 'queries': 9},
+        }}
+
+        regressions = list(find_regressions(results, baseline, 0.5))
+
+        assert regressions == [
+            'GET titles-list (1000): queries 4 -> 5',
+            'GET genres-list (1000): p95 10 -> 30 ms',
+        ], (
+            'Проверьте, что регрессиями считаются рост количества запросов '
+            'и рост p95 сверх допустимого.'
+        )
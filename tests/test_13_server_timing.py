@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+MIDDLEWARE = 'api.middleware.ServerTimingMiddleware'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_headers_disabled_by_default(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовок `Server-Timing` добавляется только '
+            'при включённом middleware.'
+        )
+
+    def test_02_server_timing_headers(self, client, admin_client, settings):
+        create_titles(admin_client)
+        settings.MIDDLEWARE = [MIDDLEWARE, *settings.MIDDLEWARE]
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+
+        assert response.status_code == HTTPStatus.OK
+        metrics = {
+            metric.split(';')[0]
+            for metric in response['Server-Timing'].split(', ')
+        }
+        assert metrics == {'db', 'permissions', 'serializer', 'total'}, (
+            'Проверьте, что заголовок `Server-Timing` содержит время '
+            'запросов к базе, проверки прав, сериализации и общее время.'
+        )
+        assert int(response['X-DB-Queries']) == len(
+            context.captured_queries
+        ), (
+            'Проверьте, что заголовок `X-DB-Queries` содержит количество '
+            'SQL-запросов.'
+        )
+
+    def test_03_write_request_timing(self, admin_client, settings):
+        settings.MIDDLEWARE = [MIDDLEWARE, *settings.MIDDLEWARE]
+        titles, _, _ = create_titles(admin_client)
+
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'name': 'Новое название'},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название'
+        assert 'serializer;dur=' in response['Server-Timing'], (
+            'Проверьте, что время валидации данных учитывается в '
+            'заголовке `Server-Timing`.'
+        )
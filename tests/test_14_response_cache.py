@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_categories,
+    create_genre,
+    create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    @pytest.mark.parametrize('url, create', (
+        ('/api/v1/categories/', create_categories),
+        ('/api/v1/genres/', create_genre),
+    ))
+    def test_01_cache_hit_without_queries(self, client, admin_client,
+                                          django_assert_num_queries,
+                                          url, create):
+        create(admin_client)
+
+        response = client.get(url, {'search': 'и'})
+        assert response['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            cached_response = client.get(url, {'search': 'и'})
+
+        assert cached_response.status_code == HTTPStatus.OK
+        assert cached_response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+            'кэша без запросов к базе данных.'
+        )
+        assert cached_response.json() == response.json()
+        assert client.get(url, {'page': 1})['X-Cache'] == 'MISS', (
+            f'Проверьте, что кэш ответов `{url}` учитывает номер страницы.'
+        )
+
+    def test_02_cache_invalidated_on_write(self, client, admin_client):
+        url = '/api/v1/categories/'
+        categories = create_categories(admin_client)
+        assert client.get(url).json()['count'] == len(categories)
+
+        response = admin_client.post(
+            url, data={'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == len(categories) + 1, (
+            'Проверьте, что после создания категории кэш списка сброшен.'
+        )
+
+        client.get(url)
+        response = admin_client.delete(f'{url}new/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(url).json()['count'] == len(categories), (
+            'Проверьте, что после удаления категории кэш списка сброшен.'
+        )
+
+    def test_03_title_list_generation(self, client, admin_client,
+                                      django_assert_num_queries):
+        url = '/api/v1/titles/'
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        assert client.get(url, {'year': 1984})['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get(url, {'name': '', 'year': 1984})
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кэша списка произведений не зависит от '
+            'пустых параметров фильтрации.'
+        )
+
+        create_single_review(admin_client, title_id, 'Отзыв', 7)
+        response = client.get(url, {'year': 1984})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['rating'] == 7, (
+            'Проверьте, что после создания отзыва кэш списка произведений '
+            'сброшен.'
+        )
+
+        admin_client.patch(
+            f'{url}{title_id}/', data={'genre': [genres[2]['slug']]}
+        )
+        response = client.get(url, {'year': 1984})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['genre'] == [genres[2]], (
+            'Проверьте, что после изменения жанров произведения кэш списка '
+            'произведений сброшен.'
+        )
+
+    def test_04_stale_response_while_refreshing(self, client, admin_client):
+        from django.core.cache import cache
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from api.cache import get_response_cache_key
+        url = '/api/v1/titles/'
+        titles, _, _ = create_titles(admin_client)
+        client.get(url)
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 7)
+        key = get_response_cache_key(
+            Request(APIRequestFactory().get(url)), 'titles', ('page',)
+        )
+        cache.add(f'{key}:refresh', True)
+
+        response = client.get(url)
+        assert response['X-Cache'] == 'STALE', (
+            'Проверьте, что пока ответ пересчитывается другим запросом, '
+            'отдаётся устаревший ответ из кэша.'
+        )
+        assert response.json()['results'][0]['rating'] is None
+
+        cache.delete(f'{key}:refresh')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['rating'] == 7
+        assert client.get(url)['X-Cache'] == 'HIT'
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_single_comment,
+    create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ETag:
+
+    def check_not_modified(self, client, url, django_assert_num_queries):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без запросов '
+            'к базе данных.'
+        )
+        assert response['ETag'] == etag
+        return etag
+
+    def test_01_title_etag(self, client, admin_client,
+                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = self.check_not_modified(
+            client, url, django_assert_num_queries
+        )
+        self.check_not_modified(
+            client, '/api/v1/titles/', django_assert_num_queries
+        )
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 5)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания отзыва `ETag` произведения '
+            'меняется.'
+        )
+        assert response['ETag'] != etag
+        assert response.json()['rating'] == 5
+
+    def test_02_reviews_and_comments_etag(self, client, admin_client,
+                                          django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id, other_title_id = titles[0]['id'], titles[1]['id']
+        review_id = create_single_review(
+            admin_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        create_single_comment(admin_client, title_id, review_id, 'Коммент')
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review_id}/comments/'
+
+        reviews_etag = self.check_not_modified(
+            client, reviews_url, django_assert_num_queries
+        )
+        self.check_not_modified(
+            client, f'{reviews_url}{review_id}/', django_assert_num_queries
+        )
+        comments_etag = self.check_not_modified(
+            client, comments_url, django_assert_num_queries
+        )
+
+        create_single_review(admin_client, other_title_id, 'Другой', 5)
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что `ETag` отзывов не меняется при изменении отзывов '
+            'другого произведения.'
+        )
+
+        admin_client.patch(
+            f'{reviews_url}{review_id}/', data={'text': 'Новый текст'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+        assert response.json()['results'][0]['text'] == 'Новый текст'
+
+        create_single_comment(admin_client, title_id, review_id, 'Ещё')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания комментария `ETag` списка '
+            'комментариев меняется.'
+        )
+        assert response.json()['count'] == 2
+
+    def test_03_author_rename_changes_etag(self, client, admin_client, user,
+                                           user_client):
+        titles, _, _ = create_titles(admin_client)
+        review_id = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 5
+        ).json()['id']
+        create_single_comment(user_client, titles[0]['id'], review_id, 'К')
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        urls = (reviews_url, f'{reviews_url}{review_id}/comments/')
+        etags = {url: client.get(url)['ETag'] for url in urls}
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'newuser'}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после изменения имени автора `ETag` '
+                f'`{url}` меняется.'
+            )
+            assert response.json()['results'][0]['author'] == 'newuser'
+
+    def test_04_deleted_parent_changes_etag(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id, other_title_id = titles[0]['id'], titles[1]['id']
+        review_id = create_single_review(
+            admin_client, other_title_id, 'Отзыв', 5
+        ).json()['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = (
+            f'/api/v1/titles/{other_title_id}/reviews/{review_id}/comments/'
+        )
+        etags = {
+            url: client.get(url)['ETag'] for url in (reviews_url, comments_url)
+        }
+
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        admin_client.delete(
+            f'/api/v1/titles/{other_title_id}/reviews/{review_id}/'
+        )
+
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что после удаления родительского объекта '
+                f'пустой список `{url}` не отвечает статусом 304.'
+            )
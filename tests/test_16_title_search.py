@@ -0,0 +1,78 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, value):
+        response = client.get(self.TITLES_URL, {'search': value})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        assert self.search(client, 'терМИН') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет произведения по началу '
+            'слов названия без учёта регистра кириллицы.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет произведения по описанию.'
+        )
+        assert self.search(client, 'крепкий back') == [], (
+            'Проверьте, что параметр `search` ищет произведения, содержащие '
+            'все слова запроса.'
+        )
+        assert len(self.search(client, '"*')) == len(titles)
+
+    def test_02_relevance_and_sync(self, client, admin_client):
+        from reviews.models import Title
+        create_titles(admin_client)
+        Title.objects.create(
+            name='Орешек знаний', description='Орешек, орешек, орешек',
+            year=2000,
+        )
+        assert self.search(client, 'орешек') == [
+            'Орешек знаний', 'Крепкий орешек'
+        ], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+        title = Title.objects.get(name='Терминатор')
+        title.name = 'Терминатор 2'
+        title.save()
+        Title.objects.filter(name='Орешек знаний').delete()
+        assert self.search(client, 'орешек') == ['Крепкий орешек'], (
+            'Проверьте, что удалённые произведения исключаются из поиска.'
+        )
+        assert self.search(client, '2') == ['Терминатор 2'], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+
+    def test_03_rebuild_command(self, client, admin_client):
+        from django.db import connection
+        create_titles(admin_client)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO reviews_title_fts(reviews_title_fts) "
+                "VALUES ('delete-all')"
+            )
+        assert self.search(client, 'терминатор') == []
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        assert 'Title search index rebuilt.' in out.getvalue()
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что команда `rebuild_search_index` заполняет индекс '
+            'поиска текущими произведениями.'
+        )
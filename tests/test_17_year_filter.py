@@ -0,0 +1,47 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17YearFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_year_filters(self, client, admin_client):
+        create_titles(admin_client)
+
+        assert self.get_names(client, {'year': 84}) == [], (
+            'Проверьте, что фильтр `year` ищет точное совпадение года.'
+        )
+        assert self.get_names(client, {'year': 1984}) == ['Терминатор']
+        assert self.get_names(
+            client, {'year_min': 1985, 'year_max': 2000}
+        ) == ['Крепкий орешек'], (
+            'Проверьте фильтры `year_min` и `year_max`.'
+        )
+        assert self.get_names(client, {'year_max': 1988}) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+
+    @pytest.mark.parametrize('params, index', (
+        ({'year_min': 1980, 'year_max': 1990}, 'title_year_idx'),
+        (
+            {'year': 1984, 'category': 'movie'},
+            'title_category_year_idx',
+        ),
+    ))
+    def test_02_year_filters_use_index(self, params, index):
+        from api.filters import TitleFilter
+        from reviews.models import Title
+
+        plan = TitleFilter(params, queryset=Title.objects.all()).qs.explain()
+
+        assert index in plan, (
+            f'Проверьте, что фильтрация произведений по {params} использует '
+            f'индекс `{index}`, план запроса: {plan}'
+        )
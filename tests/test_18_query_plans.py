@@ -0,0 +1,49 @@
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18QueryPlans:
+
+    def get_page_queryset(self, viewset, url_kwargs):
+        view = viewset(
+            action='list',
+            args=(),
+            format_kwarg=None,
+            kwargs=url_kwargs,
+            request=Request(APIRequestFactory().get('/')),
+        )
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:view.paginator.get_page_size(view.request)]
+
+    def test_01_viewsets_avoid_full_scans(self):
+        import re
+
+        from api.urls import router_v1
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+        author = User.objects.create(username='author', email='a@yamdb.fake')
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            author=author, score=5, text='Отзыв', title=title
+        )
+        Comment.objects.create(author=author, review=review, text='Коммент')
+        url_kwargs = {'title_id': title.id, 'review_id': review.id}
+
+        for prefix, viewset, basename in router_v1.registry:
+            kwargs = {
+                key: url_kwargs[key]
+                for key in re.compile(prefix).groupindex
+            }
+            plan = self.get_page_queryset(viewset, kwargs).explain()
+            full_scans = [
+                line for line in plan.splitlines()
+                if ' SCAN ' in line and ' USING ' not in line
+            ]
+            assert not (
+                full_scans and (kwargs or 'TEMP B-TREE' in plan)
+            ), (
+                f'Проверьте, что страница списка `{basename}` читается по '
+                f'индексу без полного просмотра таблицы, план запроса: {plan}'
+            )
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_writes_outbox(self, client):
+        from users.models import OutgoingEmail
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+        for _ in range(3):
+            response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо с кодом подтверждения не отправляется '
+            'во время запроса на регистрацию.'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient=data['email'], sent=None
+        ).count() == 1, (
+            'Проверьте, что повторные запросы на регистрацию не добавляют '
+            'новые письма в очередь на отправку.'
+        )
+
+    def test_02_send_emails_in_batches(self, client, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.models import OutgoingEmail
+        for idx in range(5):
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}'
+            })
+        batches = []
+        send_messages = EmailBackend.send_messages
+
+        def count_batches(self, messages):
+            batches.append(len(messages))
+            return send_messages(self, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', count_batches)
+        out = StringIO()
+        call_command('send_emails', '--batch-size', '2', stdout=out)
+
+        assert batches == [2, 2, 1], (
+            'Проверьте, что команда `send_emails` отправляет письма пачками.'
+        )
+        assert '5 emails sent.' in out.getvalue()
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(5)
+        ]
+        assert not OutgoingEmail.objects.filter(sent=None).exists()
+        call_command('send_emails', stdout=StringIO())
+        assert len(mail.outbox) == 5, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_03_failed_emails_stay_in_outbox(self, client, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.models import OutgoingEmail
+        client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+
+        def fail(self, messages):
+            raise ConnectionError
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        with pytest.raises(ConnectionError):
+            call_command('send_emails', stdout=StringIO())
+
+        assert OutgoingEmail.objects.filter(sent=None).count() == 1, (
+            'Проверьте, что при ошибке отправки письма остаются в очереди.'
+        )
+
+    def test_04_polling_deletes_old_sent_emails(self, monkeypatch):
+        from datetime import timedelta
+        from django.utils import timezone
+        from api_yamdb.settings import EMAIL_RESEND_TIMEOUT
+        from users.management.commands import send_emails
+        from users.models import OutgoingEmail
+        OutgoingEmail.objects.create(
+            message='code', recipient='valid@yamdb.fake', subject='code',
+            sent=timezone.now() - timedelta(seconds=EMAIL_RESEND_TIMEOUT + 1),
+        )
+
+        class Stop(Exception):
+            pass
+
+        def stop(interval):
+            raise Stop
+
+        monkeypatch.setattr(send_emails, 'sleep', stop)
+        with pytest.raises(Stop):
+            call_command('send_emails', '--interval', '1', stdout=StringIO())
+
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что команда `send_emails --interval` удаляет давно '
+            'отправленные письма, не дожидаясь завершения.'
+        )
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ClaimsAuthentication:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def get_client(self, user):
+        from django.contrib.auth.tokens import default_token_generator
+        response = APIClient().post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_permissions_from_claims(self, admin, user):
+        admin_client = self.get_client(admin)
+        user_client = self.get_client(user)
+        data = {'name': 'Фильм', 'slug': 'movie'}
+        admin_client.get('/api/v1/categories/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'users_user' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что права администратора проверяются по токену без '
+            'запроса пользователя из базы данных.'
+        )
+        response = user_client.post('/api/v1/categories/', data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['username'] == user.username, (
+            'Проверьте, что остальные поля пользователя загружаются из базы '
+            'данных.'
+        )
+
+    def test_02_author_from_claims(self, user):
+        from reviews.models import Review, Title
+        title = Title.objects.create(name='Произведение', year=2000)
+        user_client = self.get_client(user)
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = (
+            f'/api/v1/titles/{title.id}/reviews/{response.json()["id"]}/'
+        )
+        response = user_client.patch(review_url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор отзыва определяется по токену.'
+        )
+        assert Review.objects.get().text == 'Новый'
+
+    def test_03_role_change_invalidates_token(self, admin, user):
+        admin_client = self.get_client(admin)
+        user_client = self.get_client(user)
+        admin.role = 'user'
+        admin.save()
+
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли пользователя выданные '
+            'ему токены становятся недействительными.'
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+
+        user.is_active = False
+        user.save(update_fields=('is_active',))
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токены заблокированного пользователя '
+            'недействительны.'
+        )
+
+    def test_04_upsert_role_change_invalidates_token(self, admin, user,
+                                                     tmp_path):
+        import csv
+        from io import StringIO
+        from django.core.management import call_command
+        admin_client = self.get_client(admin)
+        user_client = self.get_client(user)
+        admin_client.get('/api/v1/users/')
+        with open(tmp_path / 'users.csv', 'w', encoding='utf-8',
+                  newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('id', 'username', 'email', 'role'))
+            writer.writerow((admin.id, admin.username, admin.email, 'user'))
+            writer.writerow((user.id, user.username, user.email, user.role))
+
+        call_command(
+            'import_csv', '--mode', 'upsert', '--path', str(tmp_path),
+            '--tables', 'users', stdout=StringIO(),
+        )
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли командой `import_csv '
+            '--mode upsert` выданные пользователю токены становятся '
+            'недействительными.'
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_05_queryset_update_invalidates_token(self, admin, user):
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+        admin_client = self.get_client(admin)
+        user_client = self.get_client(user)
+        admin_client.get('/api/v1/users/')
+
+        User.objects.filter(pk__in=(admin.pk, user.pk)).update(role='user')
+
+        assert admin_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что изменение роли через `QuerySet.update` делает '
+            'выданные пользователю токены недействительными.'
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
@@ -0,0 +1,143 @@
+from http import HTTPStatus
+from io import StringIO
+from multiprocessing import get_context
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def consume_shared_tokens(path, attempts):
+    from api.throttling import SharedMemoryBucketStore
+    store = SharedMemoryBucketStore(path)
+    for _ in range(attempts):
+        if store.consume('scope:ip:10.0.0.1', 10, 0.001):
+            store.count('scope', 'admitted')
+        else:
+            store.count('scope', 'rejected')
+
+
+@pytest.fixture
+def throttle_rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'signup': '3/min', 'token': '3/min'},
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AuthThrottle:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def test_01_username_bucket(self, throttle_rates):
+        from api.throttling import get_bucket_store
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        for _ in range(3):
+            response = APIClient(REMOTE_ADDR='10.0.0.1').post(
+                self.URL_SIGNUP, data=data
+            )
+            assert response.status_code == HTTPStatus.OK
+
+        client = APIClient(REMOTE_ADDR='10.0.0.2')
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы на регистрацию с одним именем '
+            'пользователя ограничиваются независимо от IP-адреса.'
+        )
+        assert 'Retry-After' in response
+        assert not context.captured_queries, (
+            'Проверьте, что ограниченный запрос отклоняется до обращения к '
+            'базе данных.'
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'email': 'other@yamdb.fake', 'username': 'other_username'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert get_bucket_store().get_counters('signup') == {
+            'admitted': 4, 'rejected': 1
+        }, 'Проверьте подсчёт пропущенных и отклонённых запросов.'
+
+    def test_02_ip_bucket(self, throttle_rates):
+        from api.throttling import get_bucket_store
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+        for idx in range(3):
+            response = client.post(self.URL_TOKEN, data={
+                'username': f'user{idx}', 'confirmation_code': 'code'
+            })
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_TOKEN, data={
+                'username': 'user3', 'confirmation_code': 'code'
+            })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы токена с одного IP-адреса ограничиваются.'
+        )
+        assert not context.captured_queries
+        response = APIClient(REMOTE_ADDR='10.0.0.2').post(
+            self.URL_TOKEN,
+            data={'username': 'user3', 'confirmation_code': 'code'},
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert get_bucket_store().get_counters('token') == {
+            'admitted': 4, 'rejected': 1
+        }
+        assert get_bucket_store().get_counters('signup') == {
+            'admitted': 0, 'rejected': 0
+        }
+
+    def test_03_shared_memory_store(self, tmp_path):
+        from api.throttling import SharedMemoryBucketStore
+        path = tmp_path / 'buckets'
+        context = get_context('fork')
+        processes = [
+            context.Process(target=consume_shared_tokens, args=(path, 8))
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        store = SharedMemoryBucketStore(path)
+        assert store.get_counters('scope') == {'admitted': 10, 'rejected': 14}, (
+            'Проверьте, что процессы расходуют общий запас токенов.'
+        )
+        assert not store.consume('scope:ip:10.0.0.1', 10, 0.001)
+        assert store.consume('scope:ip:10.0.0.2', 10, 0.001)
+
+    def test_04_throttle_stats_command(self, tmp_path, monkeypatch):
+        from api import throttling
+        from users.management.commands import throttle_stats
+        path = tmp_path / 'buckets'
+        store = throttling.SharedMemoryBucketStore(path)
+        monkeypatch.setattr(throttle_stats, 'THROTTLE_STORE_PATH', str(path))
+        monkeypatch.setattr(throttle_stats, 'get_bucket_store', lambda: store)
+        store.count('signup', 'admitted')
+        store.count('signup', 'rejected')
+        store.count('token', 'admitted')
+        out = StringIO()
+
+        call_command('throttle_stats', stdout=out)
+
+        assert out.getvalue().splitlines() == [
+            'signup: 1 admitted, 1 rejected',
+            'token: 1 admitted, 0 rejected',
+        ]
+
+    def test_05_non_object_body(self, throttle_rates):
+        client = APIClient()
+        for url in (self.URL_SIGNUP, self.URL_TOKEN):
+            response = client.post(url, data=[], format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что запрос к `{url}` с JSON-массивом в теле '
+                f'возвращает ответ со статусом 400.'
+            )
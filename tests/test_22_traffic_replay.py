@@ -0,0 +1,124 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+from rest_framework.test import APIClient
+
+POSTMAN_COLLECTION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'postman_collection',
+    'Ymdb-collection.postman_collection.json',
+)
+
+
+@pytest.fixture
+def recording_path(settings, tmp_path):
+    settings.RECORD_REQUESTS_PATH = str(tmp_path / 'requests.jsonl')
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE, 'api.middleware.RequestRecordingMiddleware'
+    ]
+    return settings.RECORD_REQUESTS_PATH
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TrafficReplay:
+
+    def test_01_recording_middleware(self, recording_path, admin_client):
+        client = APIClient()
+        client.post(
+            '/api/v1/auth/signup/',
+            data={'email': 'valid@yamdb.fake', 'username': 'valid_username'},
+            format='json',
+        )
+        client.post(
+            '/api/v1/auth/token/',
+            data={'username': 'valid_username', 'confirmation_code': '123'},
+        )
+        admin_client.get('/api/v1/titles/?year_min=2000&category=movie')
+
+        with open(recording_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+
+        signup, token, titles = entries
+        assert signup['method'] == 'POST'
+        assert signup['path'] == '/api/v1/auth/signup/'
+        assert signup['body']['username'] == 'valid_username'
+        assert signup['body']['email'].endswith('@yamdb.fake')
+        assert signup['body']['email'] != 'valid@yamdb.fake', (
+            'Проверьте, что адреса почты не сохраняются в записи запросов.'
+        )
+        assert token['body']['confirmation_code'] == '***', (
+            'Проверьте, что код подтверждения не сохраняется в записи '
+            'запросов.'
+        )
+        assert signup['role'] is None
+        assert titles['query'] == {'year_min': ['2000'], 'category': ['movie']}
+        assert titles['role'] == 'admin', (
+            'Проверьте, что вместо токена сохраняется роль пользователя.'
+        )
+        assert 'Bearer' not in json.dumps(entries)
+
+    def test_02_convert_postman_collection(self):
+        from reviews.management.commands.replay_traffic import load_entries
+
+        entries, variables = load_entries(POSTMAN_COLLECTION)
+
+        assert entries[0] == {
+            'method': 'POST',
+            'path': '/api/v1/auth/signup/',
+            'query': {},
+            'body': (
+                '{\n  "email": "user@no-admin.ru",\n'
+                '  "username": "regular-user"\n}'
+            ),
+            'role': None,
+        }
+        roles = {entry['role'] for entry in entries}
+        assert roles == {None, 'user', 'moderator', 'admin', 'superuser'}, (
+            'Проверьте, что токены коллекции заменяются ролями.'
+        )
+        assert {'?search=moderator'} <= {
+            f'?search={entry["query"]["search"][0]}'
+            for entry in entries if 'search' in entry['query']
+        }
+        assert 'tooLongUsername' in variables
+
+    def test_03_replay_by_route(self):
+        from reviews.management.commands.replay_traffic import Command
+        command = Command(stdout=StringIO())
+        tokens = command.create_users()
+        entries = [
+            {
+                'method': 'POST',
+                'path': '/api/v1/categories/',
+                'query': {},
+                'body': '{"name": "Фильм", "slug": "{{adminCategory}}"}',
+                'role': 'admin',
+            },
+            {
+                'method': 'GET',
+                'path': '/api/v1/categories/',
+                'query': {'search': ['Фильм']},
+                'body': None,
+                'role': None,
+            },
+            {
+                'method': 'POST',
+                'path': '/api/v1/categories/',
+                'query': {},
+                'body': {'name': 'Книга', 'slug': 'book'},
+                'role': 'user',
+            },
+        ] * 2
+
+        results = command.replay_on_server(
+            entries, 2, tokens, {'adminCategory': 'movie'}
+        )
+
+        assert results['POST categories-list']['statuses'] == {
+            201: 1, 400: 1, 403: 2
+        }, 'Проверьте, что запросы отправляются с токеном нужной роли.'
+        assert results['GET categories-list']['requests'] == 2
+        result = results['GET categories-list']
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_selects(context, table):
+    return sum(
+        query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23NestedRoutes:
+
+    def test_01_parent_loaded_once(self, user_client):
+        from reviews.models import Review, Title
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_selects(context, 'reviews_title') == 1, (
+            'Проверьте, что произведение загружается один раз за запрос на '
+            'создание отзыва.'
+        )
+        review = Review.objects.get()
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                f'{url}{review.id}/comments/', data={'text': 'Комментарий'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_selects(context, 'reviews_review') == 1, (
+            'Проверьте, что отзыв загружается один раз за запрос на создание '
+            'комментария.'
+        )
+
+        for path in (url, f'{url}{review.id}/', f'{url}{review.id}/comments/'):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get(path)
+            assert response.status_code == HTTPStatus.OK
+            assert count_selects(context, 'reviews_title') == 0, (
+                f'Проверьте, что `{path}` фильтрует объекты по `title_id` '
+                f'без загрузки произведения.'
+            )
+
+    def test_02_missing_parent(self, user, user_client):
+        from reviews.models import Review, Title
+        title = Title.objects.create(name='Произведение', year=2000)
+        other_title = Title.objects.create(name='Другое', year=2001)
+        review = Review.objects.create(
+            author=user,
+            score=5,
+            text='Отзыв',
+            title=title,
+        )
+
+        response = user_client.get(f'/api/v1/titles/{other_title.id}/reviews/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+        for path in (
+            '/api/v1/titles/999/reviews/',
+            f'/api/v1/titles/{other_title.id}/reviews/{review.id}/',
+            f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/',
+        ):
+            assert user_client.get(path).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{path}` возвращает 404.'
+            )
+        response = user_client.post(
+            f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/',
+            data={'text': 'Комментарий'},
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,39 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReviewUniqueness:
+
+    def test_01_duplicate_review(self, user_client):
+        from reviews.models import Review, ReviewCommentBaseModel, Title
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что перед созданием отзыва не проверяется наличие '
+            'отзыва автора, уникальность обеспечивает ограничение '
+            '`unique_author_title`.'
+        )
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение!']
+        }
+        assert Review.objects.count() == 1
+        assert ReviewCommentBaseModel.objects.count() == 1, (
+            'Проверьте, что при повторном отзыве не остаётся записи в '
+            'родительской таблице.'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (5, 1)
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+
+def count_user_queries(context):
+    return sum(
+        '"users_user"' in query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queries(self, client, django_user_model):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert count_user_queries(context) == 2, (
+            'Проверьте, что регистрация нового пользователя выполняет один '
+            'поиск пользователей и одну вставку.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert count_user_queries(context) == 1, (
+            'Проверьте, что повторная регистрация выполняет один запрос '
+            'пользователей.'
+        )
+
+        django_user_model.objects.create(
+            username='other_username', email='other@yamdb.fake'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data={
+                'email': 'other@yamdb.fake', 'username': 'valid_username'
+            })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()) == {'email', 'username'}
+        assert count_user_queries(context) == 1
+
+    def test_02_concurrent_signup(self, django_user_model):
+        from api.serializers import UserRegistrationSerializer
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        serializer = UserRegistrationSerializer(data=data)
+        assert serializer.is_valid()
+        user = django_user_model.objects.create(**data)
+
+        assert serializer.save() == user, (
+            'Проверьте, что при одновременной регистрации возвращается '
+            'созданный другим запросом пользователь.'
+        )
+
+        serializer = UserRegistrationSerializer(
+            data={'email': 'other@yamdb.fake', 'username': 'other_username'}
+        )
+        assert serializer.is_valid()
+        django_user_model.objects.create(
+            email='other@yamdb.fake', username='third_username'
+        )
+        with pytest.raises(ValidationError):
+            serializer.save()
+        assert not django_user_model.objects.filter(
+            username='other_username'
+        ).exists()
+
+    def test_03_signup_is_atomic(self, django_user_model, monkeypatch):
+        from api.serializers import UserRegistrationSerializer
+        from users.models import OutgoingEmail
+
+        def fail(*args, **kwargs):
+            raise ConnectionError
+
+        monkeypatch.setattr(OutgoingEmail, 'enqueue', fail)
+        serializer = UserRegistrationSerializer(
+            data={'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        )
+        assert serializer.is_valid()
+        with pytest.raises(ConnectionError):
+            serializer.save()
+
+        assert not django_user_model.objects.exists(), (
+            'Проверьте, что пользователь и письмо с кодом подтверждения '
+            'сохраняются в одной транзакции.'
+        )
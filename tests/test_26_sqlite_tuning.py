@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+from django.db import connection
+
+
+def get_pragmas(names):
+    """Return pragmas of connection opened in new thread."""
+    values = {}
+
+    def read():
+        try:
+            with connection.cursor() as cursor:
+                for name in names:
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    return values
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SqliteTuning:
+
+    def test_01_pragmas_of_new_connections(self, settings):
+        settings.SQLITE_PRAGMAS = {
+            'busy_timeout': 1234,
+            'synchronous': 'normal',
+            'cache_size': -2048,
+            'temp_store': 'memory',
+        }
+
+        assert get_pragmas(settings.SQLITE_PRAGMAS) == {
+            'busy_timeout': 1234,
+            'synchronous': 1,
+            'cache_size': -2048,
+            'temp_store': 2,
+        }, (
+            'Проверьте, что настройки `SQLITE_PRAGMAS` применяются к новым '
+            'соединениям с базой данных.'
+        )
+
+        settings.SQLITE_PRAGMAS = {}
+        assert get_pragmas(['busy_timeout']) == {'busy_timeout': 5000}
+
+    def test_02_workload(self):
+        from reviews.management.commands.benchmark_sqlite import run_workload
+        from reviews.models import Genre
+
+        result = run_workload(0.2, readers=2, writers=1)
+
+        assert result['reads_per_s'] > 0
+        assert result['writes_per_s'] > 0
+        assert Genre.objects.count() == pytest.approx(
+            result['writes_per_s'] * 0.2
+        )
@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    from api.middleware import ReplicaMiddleware
+    path = tmp_path / 'replica.sqlite3'
+    connections.settings['replica1'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{path}?mode=rw',
+    }
+    connections.ensure_defaults('replica1')
+    connections.prepare_test_settings('replica1')
+    settings.REPLICA_DATABASES = ['replica1']
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE, 'api.middleware.ReplicaMiddleware'
+    ]
+    yield path
+    connections['replica1'].close()
+    del connections.settings['replica1']
+    del connections._connections.replica1
+    ReplicaMiddleware.unavailable.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ReadReplicas:
+
+    def test_01_reads_from_replica(self, replica, admin_client):
+        from reviews.management.commands.copy_replicas import copy_database
+        from reviews.models import Title
+        copied = Title.objects.create(name='Скопированное', year=2000)
+        copy_database(connection, replica)
+        title = Title.objects.create(name='Новое', year=2001)
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+
+        response = client.get(f'/api/v1/titles/{copied.id}/')
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что безопасные запросы читают данные из реплики.'
+        )
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после записи клиент читает данные из основной '
+            'базы данных.'
+        )
+        response = admin_client.get('/api/v1/categories/')
+        assert response.json()['results'][0]['slug'] == 'movie'
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_fallback_to_primary(self, replica):
+        from api.middleware import ReplicaMiddleware
+        from reviews.models import Title
+        title = Title.objects.create(name='Новое', year=2001)
+
+        response = APIClient().get(f'/api/v1/titles/{title.id}/')
+
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что при недоступной реплике данные читаются из '
+            'основной базы данных.'
+        )
+        assert 'replica1' in ReplicaMiddleware.unavailable
+        assert not replica.exists()
+
+    def test_03_writes_and_migrations_use_primary(self, settings):
+        from api.db_routers import ReplicaRouter, read_database
+        from reviews.models import Title
+        router = ReplicaRouter()
+        token = read_database.set('replica1')
+        try:
+            assert router.db_for_read(Title) == 'replica1'
+            assert router.db_for_write(Title) == 'default'
+        finally:
+            read_database.reset(token)
+        assert router.db_for_read(Title) is None
+        settings.REPLICA_DATABASES = ['replica1']
+        assert router.allow_migrate('default', 'reviews')
+        assert not router.allow_migrate('replica1', 'reviews')
+
+    def test_04_replica_reads_are_not_cached(self, replica, admin_client):
+        from reviews.management.commands.copy_replicas import copy_database
+        from reviews.models import Title
+        title = Title.objects.create(name='Произведение', year=2000)
+        copy_database(connection, replica)
+        client = APIClient(REMOTE_ADDR='10.0.0.1')
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get('/api/v1/categories/')
+        assert response.json()['results'] == []
+        response = admin_client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ответы, прочитанные из реплики, не сохраняются '
+            'в кэш ответов.'
+        )
+        assert response.json()['results'][0]['slug'] == 'movie'
+
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'ETag' not in response, (
+            'Проверьте, что ответы, прочитанные из реплики, не содержат '
+            '`ETag`.'
+        )